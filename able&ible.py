@@ -1,8 +1,30 @@
 import streamlit as st
-import google.generativeai as genai
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import random
 import time
 import os
+import logging
+import hashlib
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from wizard.cache import ExplanationCache, DEFAULT_PATH as CACHE_PATH
+from wizard.lessons import EXPLANATIONS_FILE, LESSONS_DIR, LessonCatalog
+from wizard.explanations import load_explanations
+from wizard.progress import ActivityState
+from wizard.word_builder import build_word
+from wizard.store import ProgressStore, DEFAULT_PATH as PROGRESS_PATH
+from wizard.shared import SharedStore
+from wizard.events import EventLog, DEFAULT_PATH as EVENTS_PATH
+from wizard.singleflight import SingleFlight
+from wizard.resilience import OPEN as BREAKER_OPEN, CircuitBreaker, TokenBucket
+from wizard import rules
+from wizard.gemini import GEMINI_MODEL, GeminiClient, explanation_prompt
+from wizard import metrics
+from wizard.metrics import REGISTRY
+
+run_started = time.perf_counter()
 
 # --- Configuration & Styles ---
 st.set_page_config(
@@ -13,368 +35,488 @@ st.set_page_config(
 )
 
 # Custom CSS for Trident Academy Branding and Activity Specifics
-st.markdown("""
-<style>
-    /* Global Styles */
-    .stApp {
-        background-color: #f8f9fa;
-    }
-    .main-header {
-        font-family: 'Comic Sans MS', 'Comic Sans', cursive;
-        color: #003366;
-        text-align: center;
-        font-size: 3rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        color: #555;
-        text-align: center;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-    }
-    
-    /* Button Styling - Default Blue */
-    .stButton button {
-        background-color: #003366;
-        color: white;
-        border-radius: 20px;
-        font-weight: bold;
-        padding: 0.5rem 1rem;
-        border: 2px solid #003366;
-        transition: transform 0.1s;
-    }
-    .stButton button:hover {
-        background-color: #004080;
-        color: #FFCC00;
-        transform: scale(1.05);
-    }
-
-    /* Primary Button Styling (Check Answer) - Green & Big */
-    div.stButton > button[kind="primary"] {
-        background-color: #28a745;
-        border-color: #28a745;
-        color: white;
-        font-size: 1.3rem;
-        padding: 0.75rem 2rem;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.2);
-    }
-    div.stButton > button[kind="primary"]:hover {
-        background-color: #218838;
-        border-color: #1e7e34;
-        color: white;
-        transform: scale(1.05);
-        box-shadow: 0 0 15px rgba(40, 167, 69, 0.6);
-    }
-
-    /* Activity 1: Syllable Detective */
-    [data-testid="stForm"] {
-        background-color: #e3f2fd;
-        border: 3px dashed #003366;
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-
-    /* Activity 2: Word Builder Zones */
-    .wb-workshop {
-        background-color: #003366; /* Trident Blue */
-        color: white;
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.2);
-    }
-    .wb-parts-bin {
-        background-color: #FFF3CD; /* Light Gold */
-        border: 2px solid #FFCC00;
-        padding: 2rem;
-        border-radius: 15px;
-        margin-bottom: 2rem;
-        text-align: center;
-    }
-    .built-word-display {
-        background-color: white;
-        border: 2px solid #003366;
-        border-radius: 10px;
-        padding: 1rem;
-        font-size: 2.5rem;
-        font-family: monospace;
-        letter-spacing: 5px;
-        color: #003366;
-        margin-bottom: 2rem;
-        display: inline-block;
-        min-width: 300px;
-    }
-    .wb-controls {
-        padding: 1rem;
-        border-top: 1px solid #ccc;
-        margin-top: 2rem;
-    }
-
-    /* Activity 3: Sentence Master */
-    .sentence-display {
-        font-size: 2.5rem !important;
-        font-weight: bold;
-        color: #333;
-        line-height: 1.5;
-        padding: 20px;
-        background: white;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        text-align: center;
-    }
-    .filled-word {
-        color: #28a745;
-        text-decoration: underline;
-        font-weight: 800;
-    }
-    .blank-space {
-        color: #FFCC00;
-        text-decoration: underline;
-        font-weight: 800;
-    }
-    
-    /* Activity 4: Antonym Bubbles */
-    .antonym-clue {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #003366;
-        text-align: center;
-    }
-    .antonym-answer-box {
-        font-size: 3rem; 
-        font-weight: bold; 
-        color: #28a745; /* Green for correct */
-        text-align: center;
-        border: 3px solid #28a745;
-        border-radius: 15px;
-        padding: 10px;
-        background-color: white;
-        display: inline-block;
-        min-width: 300px;
-    }
-    .antonym-placeholder {
-        font-size: 3rem;
-        color: #ccc;
-        border-bottom: 3px solid #003366;
-        display: inline-block;
-        min-width: 150px;
-        text-align: center;
-    }
-    
-    /* Activity 6: Reading */
-    .story-box {
-        background-color: #fff;
-        padding: 2rem;
-        border-radius: 10px;
-        border-left: 10px solid #003366;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-    }
-    .quiz-box {
-        background-color: #FFCC00;
-        padding: 2rem;
-        border-radius: 10px;
-        color: #003366;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-
-</style>
-""", unsafe_allow_html=True)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+@st.cache_resource
+def get_stylesheet():
+    """(href, css) for static/wizard.css; the href carries a content hash so browsers can cache it"""
+    with open(os.path.join(STATIC_DIR, "wizard.css"), "rb") as f:
+        css = f.read()
+    return f"app/static/wizard.css?v={hashlib.sha256(css).hexdigest()[:12]}", css.decode("utf-8")
+
+stylesheet_href, stylesheet_css = get_stylesheet()
+if st.get_option("server.enableStaticServing"):
+    # Identical on every rerun, so the browser fetches the file once per page load
+    st.markdown(f'<link rel="stylesheet" href="{stylesheet_href}">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{stylesheet_css}</style>", unsafe_allow_html=True)
 
 # --- Gemini Setup ---
 api_key = st.secrets.get("API_KEY") or os.environ.get("API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.5-flash')
+
+@st.cache_resource
+def get_gemini_client(api_key):
+    """One client per process (and per key); the SDK itself is imported on first use"""
+    client = GeminiClient(api_key, GEMINI_MODEL, timeout=float(os.environ.get("WIZARD_GEMINI_TIMEOUT", "8")))
+    if os.environ.get("WIZARD_WARMUP", "").lower() in ("1", "true", "yes"):
+        client.warm_up_in_background()
+    return client
+
+gemini = get_gemini_client(api_key) if api_key else None
+
+@st.cache_resource
+def get_gemini_guards():
+    # Shared by every session in the process: stop calling a failing API, and cap the call rate
+    breaker = CircuitBreaker(
+        failure_threshold=int(os.environ.get("WIZARD_GEMINI_FAILURES", "5")),
+        reset_timeout=float(os.environ.get("WIZARD_GEMINI_COOLDOWN", "30")),
+    )
+    bucket = TokenBucket(
+        rate=float(os.environ.get("WIZARD_GEMINI_RATE", "2")),
+        burst=int(os.environ.get("WIZARD_GEMINI_BURST", "10")),
+    )
+    return breaker, bucket
+
+gemini_breaker, gemini_bucket = get_gemini_guards()
+
+@st.cache_resource
+def get_shared_store():
+    # Set by `python -m wizard.shared serve`: explanations mapped once for all workers (lessons are still parsed per worker)
+    path = os.environ.get("WIZARD_SHARED_STORE")
+    return SharedStore(path) if path else None
+
+@st.cache_resource
+def get_explanation_cache():
+    # One cache per server process; the SQLite tier is shared across processes and restarts.
+    # Pregenerated explanations ship with the lessons and answer most tips without Gemini.
+    preloaded = get_shared_store()
+    if preloaded is None:
+        lessons_dir = os.environ.get("WIZARD_LESSONS_DIR", LESSONS_DIR)
+        preloaded = load_explanations(os.path.join(lessons_dir, EXPLANATIONS_FILE))
+    return ExplanationCache(os.environ.get("WIZARD_CACHE_PATH", CACHE_PATH), preloaded=preloaded)
+
+explanation_cache = get_explanation_cache()
+
+# Tips are fetched off the script thread so the next word renders straight away
+TIP_DEADLINE_SECONDS = float(os.environ.get("WIZARD_TIP_DEADLINE", "10"))
+
+@st.cache_resource
+def get_tip_executor():
+    workers = int(os.environ.get("WIZARD_TIP_WORKERS", "4"))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wizard-tip")
+
+@st.cache_resource
+def get_gemini_flights():
+    # Sessions asking for the same prompt at the same time share one Gemini call
+    return SingleFlight(get_tip_executor())
+
+gemini_flights = get_gemini_flights()
+
+@st.cache_resource
+def get_progress_store():
+    # One pooled connection and write-behind thread per process; WIZARD_PROGRESS_PATH="" turns it off
+    path = os.environ.get("WIZARD_PROGRESS_PATH", PROGRESS_PATH)
+    return ProgressStore(path) if path else None
+
+progress_store = get_progress_store()
+
+@st.cache_resource
+def get_event_log():
+    # Every answer, appended for `python -m wizard.analytics`; WIZARD_EVENTS_PATH="" turns it off
+    path = os.environ.get("WIZARD_EVENTS_PATH", EVENTS_PATH)
+    return EventLog(path) if path else None
+
+event_log = get_event_log()
+
+# --- Instrumentation ---
+@st.cache_resource
+def start_metrics_exporters():
+    """Optional local /metrics endpoint and periodic log line, once per process"""
+    REGISTRY.register_gauges("wizard_explanation_cache", explanation_cache.stats)
+    REGISTRY.register_gauges("wizard_gemini_calls", gemini_flights.stats)
+    REGISTRY.register_gauges("wizard_gemini_breaker", gemini_breaker.stats)
+    REGISTRY.register_gauges("wizard_gemini_rate_limit", gemini_bucket.stats)
+    if progress_store:
+        REGISTRY.register_gauges("wizard_progress_store", progress_store.stats)
+    if event_log:
+        REGISTRY.register_gauges("wizard_event_log", event_log.stats)
+    port = os.environ.get("WIZARD_METRICS_PORT")
+    if port:
+        try:
+            metrics.serve(int(port))
+        except OSError as e:
+            logging.getLogger(__name__).warning("metrics endpoint not started: %s", e)
+    interval = os.environ.get("WIZARD_METRICS_LOG_INTERVAL")
+    if interval:
+        metrics.start_log_reporter(float(interval))
+    return True
+
+start_metrics_exporters()
 
 # --- Constants & Data ---
-SYLLABLE_DATA = [
-    {"id": 1, "word": "presentable", "correctSyllables": ["pre", "sent", "able"]},
-    {"id": 2, "word": "miserable", "correctSyllables": ["mis", "er", "able"]},
-    {"id": 3, "word": "valuable", "correctSyllables": ["val", "u", "able"]},
-    {"id": 4, "word": "impossible", "correctSyllables": ["im", "poss", "ible"]},
-    {"id": 5, "word": "dependable", "correctSyllables": ["de", "pend", "able"]},
-    {"id": 6, "word": "reversible", "correctSyllables": ["re", "vers", "ible"]},
-    {"id": 7, "word": "favorable", "correctSyllables": ["fa", "vor", "able"]},
-]
-
-WORD_BUILDER_DATA = [
-    {"id": 1, "parts": ["val", "u", "able"], "meaning": "worth a lot", "targetWord": "valuable"},
-    {"id": 2, "parts": ["re", "li", "able"], "meaning": "dependable", "targetWord": "reliable"},
-    {"id": 3, "parts": ["in", "cred", "ible"], "meaning": "fantastic", "targetWord": "incredible"},
-    {"id": 4, "parts": ["in", "vis", "ible"], "meaning": "not able to be seen", "targetWord": "invisible"},
-    {"id": 5, "parts": ["re", "vers", "ible"], "meaning": "able to be turned inside out", "targetWord": "reversible"},
-    {"id": 6, "parts": ["re", "mark", "able"], "meaning": "astonishing", "targetWord": "remarkable"},
-    {"id": 7, "parts": ["div", "is", "ible"], "meaning": "able to be divided", "targetWord": "divisible"},
-]
-
-SENTENCE_DATA = [
-    {"id": 1, "sentencePart1": "My grandmother's gold ring cost a lot of money. It is very", "sentencePart2": ".", "options": ["valueless", "valuable"], "correctOption": "valuable"},
-    {"id": 2, "sentencePart1": "The sunny weather was", "sentencePart2": "for our picnic, so we had a great time!", "options": ["favored", "favorable"], "correctOption": "favorable"},
-    {"id": 3, "sentencePart1": "Dry wood is highly", "sentencePart2": ", so keep it away from the campfire flames.", "options": ["combust", "combustible"], "correctOption": "combustible"},
-    {"id": 4, "sentencePart1": "My old car starts every single morning. It is very", "sentencePart2": ".", "options": ["depend", "dependable"], "correctOption": "dependable"},
-    {"id": 5, "sentencePart1": "Please comb your hair and tuck in your shirt so you look", "sentencePart2": "for the photo.", "options": ["presented", "presentable"], "correctOption": "presentable"},
-    {"id": 6, "sentencePart1": "The number ten is evenly", "sentencePart2": "by the number two.", "options": ["divide", "divisible"], "correctOption": "divisible"},
-    {"id": 7, "sentencePart1": "Don't worry about the mess! This marker is", "sentencePart2": "and comes off with soap.", "options": ["wash", "washable"], "correctOption": "washable"},
-]
-
-ANTONYM_DATA = [
-    {"id": 1, "clue": "Calm and quiet", "answer": "excitable"},
-    {"id": 2, "clue": "Crazy", "answer": "sensible"},
-    {"id": 3, "clue": "Worthless", "answer": "valuable"},
-    {"id": 4, "clue": "Happy", "answer": "miserable"},
-    {"id": 5, "clue": "Impossible", "answer": "possible"},
-    {"id": 6, "clue": "Cozy", "answer": "uncomfortable"},
-    {"id": 7, "clue": "Useless", "answer": "usable"},
-]
-
-YES_NO_DATA = [
-    {"id": 1, "question": "Can a raincoat be reversible?", "answer": True},
-    {"id": 2, "question": "Are most glasses nonbreakable?", "answer": False},
-    {"id": 3, "question": "Is fried liver horrible?", "answer": True},
-    {"id": 4, "question": "Can a dry forest be combustible?", "answer": True},
-    {"id": 5, "question": "Are your grades in school improvable?", "answer": True},
-    {"id": 6, "question": "Is your handsome face washable?", "answer": True},
-    {"id": 7, "question": "Is a fresh quart of milk returnable?", "answer": False},
-]
-
-READING_STORIES = [
-    {
-        "id": 1,
-        "title": "An Unforgettable Cruise",
-        "paragraphs": [
-            "One hazy day Nancy and her dad were cruising on their 36-foot sailboat on Lake Michigan. The weather report that morning was favorable so they headed for Muskegon.",
-            "About noontime the sun disappeared, waves began to roll, and dense fog set in. Three miles offshore, land was suddenly invisible. It was incredible that the weather could be so changeable.",
-            "Dad got out his compass and charts and began to take bearings. How far to Muskegon? It was possible that they were fairly close.",
-            "Groping their way slowly through the dense fog was miserable. The fog was so thick now you could barely see the bow of the boat. Presently the channel light became visible, and they set their course toward it.",
-            "Suddenly a terrible, thunderous sound startled them. Nancy looked up and there, looming behind them in the fog, was the unmistakable shape of a huge steamship. Would the ship see Nancy and her dad in this fog?"
-        ],
-        "questions": [
-            {"question": "What was the weather like when they started?", "options": ["Horrible", "Favorable", "Invisible", "Miserable"], "correctAnswer": "Favorable"},
-            {"question": "The land became _______ when the fog set in.", "options": ["Visible", "Invisible", "Changeable", "Unmistakable"], "correctAnswer": "Invisible"},
-            {"question": "The sound of the steamship was:", "options": ["Quiet", "Terrible and Thunderous", "Combustible", "Playful"], "correctAnswer": "Terrible and Thunderous"}
-        ]
-    },
-    {
-        "id": 2,
-        "title": "The Incredible Robot",
-        "paragraphs": [
-            "Tim decided to build a robot for the school science fair. His friends said it was impossible to build one in just a week, but Tim was a sensible boy who planned ahead.",
-            "He used flexible plastic parts so the robot would not be breakable if it fell. The electronic sensors were very valuable, so he handled them with care.",
-            "On the day of the fair, the robot worked perfectly! The judges said Tim's invention was remarkable. It could even do the dishes.",
-            "Tim felt very capable. Winning the first prize trophy was tangible proof of his hard work."
-        ],
-        "questions": [
-            {"question": "What did Tim's friends think about his plan?", "options": ["It was sensible", "It was impossible", "It was favorable", "It was invisible"], "correctAnswer": "It was impossible"},
-            {"question": "Why did Tim use flexible plastic?", "options": ["So it was not breakable", "So it was edible", "So it was miserable", "So it was combustible"], "correctAnswer": "So it was not breakable"},
-            {"question": "The judges thought the invention was:", "options": ["Terrible", "Remarkable", "Changeable", "Valueless"], "correctAnswer": "Remarkable"}
-        ]
-    }
-]
+@st.cache_resource
+def get_catalog():
+    # Only the small catalog index is read up front; a shared store serves the same interface.
+    # (Not `store or ...`: a store's len() counts explanations, so one with none would be falsy.)
+    store = get_shared_store()
+    return store if store is not None else LessonCatalog(os.environ.get("WIZARD_LESSONS_DIR", LESSONS_DIR))
+
+@st.cache_resource(max_entries=64)
+def get_lesson(lesson_id):
+    # Parsed once per process the first time any student opens it; frozen so every session can share it.
+    # With a shared store only the raw pack bytes are shared - each worker still holds its own parsed copy.
+    return get_catalog().load(lesson_id)
+
+catalog = get_catalog()
+if st.session_state.get('lesson_id') not in catalog:
+    st.session_state.lesson_id = catalog.default_id
+
+lesson = get_lesson(st.session_state.lesson_id)
+SYLLABLE_DATA = lesson.syllables
+WORD_BUILDER_DATA = lesson.word_builder
+SENTENCE_DATA = lesson.sentences
+ANTONYM_DATA = lesson.antonyms
+YES_NO_DATA = lesson.yes_no
+READING_STORIES = lesson.stories
 
 # --- State Management ---
 if 'current_activity' not in st.session_state:
     st.session_state.current_activity = None
-if 'completed_syllables' not in st.session_state:
-    st.session_state.completed_syllables = []
-if 'completed_words' not in st.session_state:
-    st.session_state.completed_words = []
-# Index trackers for one-at-a-time activities
-if 'sent_index' not in st.session_state:
-    st.session_state.sent_index = 0
-if 'ant_index' not in st.session_state:
-    st.session_state.ant_index = 0
-if 'yn_index' not in st.session_state:
-    st.session_state.yn_index = 0
+# One ActivityState record per activity, created on first visit
+if 'activities' not in st.session_state:
+    st.session_state.activities = {}
 if 'reading_story_index' not in st.session_state:
     st.session_state.reading_story_index = 0
-if 'reading_quiz_index' not in st.session_state:
-    st.session_state.reading_quiz_index = 0
 if 'story_is_read' not in st.session_state:
     st.session_state.story_is_read = False
+if 'story_page' not in st.session_state:
+    st.session_state.story_page = 0
+if 'adaptive' not in st.session_state:
+    st.session_state.adaptive = False
 if 'wb_difficulty' not in st.session_state:
     st.session_state.wb_difficulty = 'normal'
+# Each session shuffles with its own RNG - never the process-global one other sessions share
+if 'rng' not in st.session_state:
+    st.session_state.rng = random.Random()
+if 'wizard_tip' not in st.session_state:
+    st.session_state.wizard_tip = None
+if 'feedback' not in st.session_state:
+    st.session_state.feedback = None
+if 'reruns' not in st.session_state:
+    st.session_state.reruns = 0
+    REGISTRY.inc("wizard_sessions_total")
+st.session_state.reruns += 1
+REGISTRY.inc("wizard_reruns_total")
+
+# --- Persistence ---
+# Students are identified by ?student=... in the URL, so a refresh (or a
+# restarted server) picks their progress back up from the progress store.
+# The event log only ever sees a hash of the id.
+SESSION_RECORD = "session"  # store row for the non-activity fields below
+
+student_id = st.query_params.get("student")
+if (progress_store or event_log) and not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", student_id or ""):
+    student_id = st.query_params["student"] = secrets.token_urlsafe(9)
+
+def load_progress():
+    """Replace this session's progress with the stored copy - one indexed query"""
+    rows = progress_store.load(student_id, lesson.id)
+    activities = {}
+    for activity, data in rows.items():
+        if activity == SESSION_RECORD:
+            continue
+        try:
+            state = ActivityState.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            continue  # Unreadable: start that activity afresh
+        # Positions only mean something for the same items in the same order; an
+        # edited pack (even with the same item count) starts that activity afresh
+        if state.pack == lesson.fingerprints.get(activity):
+            activities[activity] = state
+    st.session_state.activities = activities
+    session = rows.get(SESSION_RECORD, {})
+    st.session_state.reading_story_index = session.get("reading_story_index", 0) % max(1, len(READING_STORIES))
+    st.session_state.story_is_read = session.get("story_is_read", False)
+    st.session_state.story_page = 0
+    st.session_state.saved_progress = rows
+    st.session_state.progress_for = (student_id, lesson.id)
+
+def save_progress():
+    """Queue writes for whatever changed since the last save (never blocks on disk)"""
+    if not progress_store or st.session_state.get("progress_for") is None:
+        return
+    student, lesson_id = st.session_state.progress_for
+    current = {activity: state.to_dict() for activity, state in st.session_state.activities.items()}
+    current[SESSION_RECORD] = {
+        "reading_story_index": st.session_state.reading_story_index,
+        "story_is_read": st.session_state.story_is_read,
+    }
+    saved = st.session_state.saved_progress
+    for activity, data in current.items():
+        if saved.get(activity) != data:
+            progress_store.save(student, lesson_id, activity, data)
+    for activity in saved.keys() - current.keys():
+        progress_store.delete(student, lesson_id, activity)
+    st.session_state.saved_progress = current
+
+if progress_store and st.session_state.get("progress_for") != (student_id, lesson.id):
+    load_progress()
 
 # --- Helper Functions ---
 def go_home():
     st.session_state.current_activity = None
 
-def celebrate_success():
-    """Randomized visual reward system"""
-    effect = random.choice(["balloons", "snow", "magic"])
+# How long a celebration / error flash stays on screen after it was triggered
+FEEDBACK_SECONDS = 3
+
+def queue_feedback(kind=None, message=None, html=None, effect=None, seconds=FEEDBACK_SECONDS):
+    """Feedback is shown by the *next* rerun until its deadline - nothing sleeps"""
+    st.session_state.feedback = {
+        "kind": kind,
+        "message": message,
+        "html": html,
+        "effect": effect,
+        "until": time.time() + seconds,
+    }
+
+def show_feedback():
+    fb = st.session_state.feedback
+    if not fb:
+        return
+    if time.time() >= fb["until"]:
+        st.session_state.feedback = None
+        return
+
+    # One-shot effects play once, the banner stays until the deadline
+    effect, fb["effect"] = fb["effect"], None
     if effect == "balloons":
         st.balloons()
     elif effect == "snow":
         st.snow()
-    else:
+    elif effect == "magic":
         st.toast("✨ Magical! Outstanding Work! ✨", icon="🧙‍♂️")
-        time.sleep(0.5)
         st.toast("🌟 You are a Word Wizard! 🌟", icon="⭐")
 
+    if fb["html"]:
+        st.markdown(fb["html"], unsafe_allow_html=True)
+    if fb["kind"] == "success" and fb["message"]:
+        st.success(fb["message"])
+    elif fb["kind"] == "error" and fb["message"]:
+        st.error(fb["message"])
+
+def celebrate_success(message=None, html=None):
+    """Randomized visual reward system"""
+    effect = st.session_state.rng.choice(["balloons", "snow", "magic"])
+    queue_feedback("success", message=message, html=html, effect=effect)
+
 def play_error():
     st.toast("Not quite! Try again.", icon="❌")
 
-def reset_progress():
-    st.session_state.completed_syllables = []
-    st.session_state.completed_words = []
-    st.session_state.sent_index = 0
-    st.session_state.ant_index = 0
-    st.session_state.yn_index = 0
-    st.session_state.reading_quiz_index = 0
+def next_card():
+    """Rerun just the calling activity fragment - the rest of the page is left as it is"""
+    save_progress()
+    ctx = get_script_run_ctx()
+    # A click can still be handled by a full-app run (e.g. merged with a pending
+    # rerun), where a fragment-scoped rerun isn't allowed
+    st.rerun(scope="fragment" if ctx and ctx.fragment_ids_this_run else "app")
+
+def log_answer(activity, state, item_id, correct, part=0):
+    """Append one answer to the class event log (queued, never waits on disk)"""
+    if event_log:
+        event_log.record(student_id, lesson.id, activity, item_id, correct, state.seconds_on_item(), part)
+
+def get_activity_state(activity, total):
+    """The session's state record for `activity` (a pack activity name, see wizard.content.ACTIVITIES)"""
+    state = st.session_state.activities.get(activity)
+    if state is None or state.progress.total != total:
+        state = st.session_state.activities[activity] = ActivityState(total, lesson.fingerprints[activity])
+    return state
+
+def handle_miss(state, index):
+    """Record a wrong answer. In adaptive practice the item is re-queued and
+    this returns True: the caller moves on instead of retrying it"""
+    if not st.session_state.adaptive:
+        state.record_miss(index)
+        return False
+    state.miss(index)
+    queue_feedback("error", "Not quite! That one will come back a little later.")
+    return True
+
+def reset_activity(activity):
+    st.session_state.activities.pop(activity, None)
+
+def clear_progress():
+    # Constant time: the old records are simply dropped
+    st.session_state.activities = {}
     st.session_state.story_is_read = False
-    
-    # Reset activity specific session states
-    keys_to_remove = [k for k in st.session_state.keys() if k.startswith("antonym_") or k.startswith("yn_answered_")]
-    for k in keys_to_remove:
-        del st.session_state[k]
-        
-    st.success("Progress Reset!")
-    time.sleep(1)
+    st.session_state.story_page = 0
+
+def reset_progress():
+    clear_progress()
+    queue_feedback("success", "Progress Reset!", seconds=1)
     st.rerun()
 
+def switch_lesson(lesson_id):
+    # The old lesson's progress stays in the store; the new one is loaded on the next run
+    save_progress()
+    st.session_state.progress_for = None
+    clear_progress()
+    st.session_state.reading_story_index = 0
+    st.session_state.wizard_tip = None
+    st.session_state.lesson_id = lesson_id
+
 # --- Gemini Functions ---
-def ask_gemini_explanation(word):
-    if not api_key:
+def generate_explanation(prompt, flight=None):
+    """Cache-miss path: ask Gemini and remember the answer.
+
+    Given the `flight` it runs in, the answer is streamed into flight.partial as it arrives.
+    Returns None without calling Gemini while the breaker is open or the rate limit is spent.
+    """
+    # Breaker first: calls refused while it is open must not spend rate budget
+    if not gemini_breaker.allow():
+        REGISTRY.inc("wizard_gemini_skipped_total", reason="circuit_open")
+        return None
+    if not gemini_bucket.try_acquire():
+        gemini_breaker.cancel()
+        REGISTRY.inc("wizard_gemini_skipped_total", reason="rate_limited")
         return None
+    start = time.perf_counter()
     try:
-        prompt = f"Explain to a 4th grade student why the word '{word}' is spelled with its specific suffix (-able or -ible). Keep it encouraging and brief (under 30 words)."
-        response = model.generate_content(prompt)
-        return response.text
+        if flight is None:
+            text = gemini.generate(prompt)
+        else:
+            text = ""
+            for chunk in gemini.stream(prompt):
+                if not text:
+                    REGISTRY.observe("wizard_gemini_ttft_seconds", time.perf_counter() - start)
+                text += chunk
+                flight.partial = text
     except Exception as e:
+        gemini_breaker.record_failure()
+        outcome = "timeout" if isinstance(e, TimeoutError) or "deadline" in str(e).lower() else "error"
+        REGISTRY.observe("wizard_gemini_seconds", time.perf_counter() - start, outcome=outcome)
+        logging.getLogger(__name__).warning("Gemini call failed (%s): %r", outcome, e)
         return None
+    gemini_breaker.record_success()
+    REGISTRY.observe("wizard_gemini_seconds", time.perf_counter() - start, outcome="ok")
+    if text:
+        explanation_cache.put(GEMINI_MODEL, prompt, text)
+    return text
+
+def request_wizard_tip(word, parts=None):
+    """Start fetching a tip for `word` and attach it to this session"""
+    # The spelling rules explain most words instantly; Gemini only gets the ones they can't
+    ruled = rules.explain(word, parts)
+    if ruled:
+        REGISTRY.inc("wizard_rule_tips_total")
+        st.session_state.wizard_tip = {"word": word, "text": ruled, "flight": None, "deadline": None}
+        return
+    if not gemini:
+        st.session_state.wizard_tip = None
+        return
+    prompt = explanation_prompt(word)
+    cached = explanation_cache.get(GEMINI_MODEL, prompt)
+    if cached is not None:
+        st.session_state.wizard_tip = {"word": word, "text": cached, "flight": None, "deadline": None}
+        return
+    if gemini_breaker.state == BREAKER_OPEN:
+        st.session_state.wizard_tip = None  # don't leave the last word's tip up
+        return  # Gemini is down: no spinner, the student just carries on
+    # Joins the call another session already has in flight for this word, if any
+    flight = gemini_flights.submit(prompt, generate_explanation, prompt)
+    st.session_state.wizard_tip = {"word": word, "text": None, "flight": flight, "deadline": time.time() + TIP_DEADLINE_SECONDS}
+
+# How often a pending tip is redrawn while it streams in
+TIP_POLL_SECONDS = 0.25
+
+@st.fragment(run_every=TIP_POLL_SECONDS)
+def wizard_tip_poller():
+    tip = st.session_state.get("wizard_tip")
+    if not tip or tip["flight"] is None:
+        return
+    flight = tip["flight"]
+    if flight.future.done():
+        text = flight.future.result()
+        if text:
+            tip["text"], tip["flight"] = text, None
+        else:
+            st.session_state.wizard_tip = None
+        # A full rerun shows the finished tip and stops this fragment's timer
+        st.rerun()
+    elif flight.partial:
+        st.success(f"Wizard says ({tip['word']}): {flight.partial.rstrip()} ▌")
+    elif time.time() > tip["deadline"]:
+        # Nothing arrived in time - drop it silently (once text is streaming it may finish).
+        # The call is not cancelled: other sessions may share it, and its answer still gets cached.
+        st.session_state.wizard_tip = None
+        st.rerun()
+    else:
+        st.caption("🔮 The AI Wizard is thinking of a tip...")
+
+def show_wizard_tip():
+    tip = st.session_state.get("wizard_tip")
+    if not tip:
+        return
+    if tip["flight"] is not None:
+        wizard_tip_poller()
+    elif tip["text"]:
+        st.success(f"Wizard says ({tip['word']}): {tip['text']}")
+
+def wizard_stats_panel():
+    # Tucked away in the (collapsed) sidebar so teachers can check the API bill is dropping
+    with st.sidebar:
+        st.markdown("### 🔮 AI Wizard Stats")
+        st.json({
+            "explanation_cache": explanation_cache.stats(),
+            "session_reruns": st.session_state.reruns,
+        }, expanded=False)
 
 # --- Activities ---
 
 def activity_menu():
     st.markdown("<h1 class='main-header'>Trident Word Wizards 🧙‍♂️</h1>", unsafe_allow_html=True)
-    st.markdown("<p class='sub-header'>Lesson 6: <span style='background:#FFCC00; padding:2px 5px; border-radius:4px'>-able</span> & <span style='background:#FFCC00; padding:2px 5px; border-radius:4px'>-ible</span></p>", unsafe_allow_html=True)
+    focus = " & ".join(f"<span style='background:#FFCC00; padding:2px 5px; border-radius:4px'>{f}</span>" for f in lesson.focus)
+    st.markdown(f"<p class='sub-header'>{lesson.title}: {focus}</p>", unsafe_allow_html=True)
+
+    # Lesson selector (only shown once there is more than one pack)
+    if len(catalog.entries) > 1:
+        ids = [e.id for e in catalog.entries]
+        chosen = st.selectbox("Choose a lesson:", ids, index=ids.index(lesson.id), format_func=catalog.title)
+        if chosen != lesson.id:
+            switch_lesson(chosen)
+            st.rerun()
+
+    # Adaptive practice: missed items are re-queued with spaced repetition (wizard.scheduler)
+    st.session_state.adaptive = st.toggle(
+        "🧠 Adaptive practice",
+        value=st.session_state.adaptive,
+        help="Missed items come back a few turns later instead of being retried straight away",
+    )
 
     col1, col2, col3 = st.columns(3)
     
+    # A pack may leave activities out - only offer the ones it has items for
     with col1:
-        if st.button("✂️ Syllable Split", use_container_width=True):
+        if SYLLABLE_DATA and st.button("✂️ Syllable Split", use_container_width=True):
             st.session_state.current_activity = "SYLLABLES"
             st.rerun()
-        if st.button("🔄 Opposites", use_container_width=True):
+        if ANTONYM_DATA and st.button("🔄 Opposites", use_container_width=True):
             st.session_state.current_activity = "ANTONYMS"
             st.rerun()
 
     with col2:
-        if st.button("🔨 Word Builder", use_container_width=True):
+        if WORD_BUILDER_DATA and st.button("🔨 Word Builder", use_container_width=True):
             st.session_state.current_activity = "WORD_BUILDER"
             st.rerun()
-        if st.button("👍 Yes or No?", use_container_width=True):
+        if YES_NO_DATA and st.button("👍 Yes or No?", use_container_width=True):
             st.session_state.current_activity = "YES_NO"
             st.rerun()
 
     with col3:
-        if st.button("✍️ Sentence Master", use_container_width=True):
+        if SENTENCE_DATA and st.button("✍️ Sentence Master", use_container_width=True):
             st.session_state.current_activity = "SENTENCE_FILL"
             st.rerun()
-        if st.button("📖 Reading Comp", use_container_width=True):
+        if READING_STORIES and st.button("📖 Reading Comp", use_container_width=True):
             st.session_state.current_activity = "READING"
             st.rerun()
     
@@ -382,61 +524,62 @@ def activity_menu():
     if st.button("🗑️ Reset All Progress"):
         reset_progress()
 
+@REGISTRY.timed("wizard_activity_seconds", activity="syllables")
 def syllable_splitter():
     st.header("✂️ Syllable Detective")
     
     # Progress
-    total = len(SYLLABLE_DATA)
-    completed = len(st.session_state.completed_syllables)
-    st.progress(completed / total if total > 0 else 0)
+    state = get_activity_state("syllables", len(SYLLABLE_DATA))
+    progress = state.progress
+    st.progress(progress.fraction)
+    show_wizard_tip()
     
     # Get Task
-    incomplete = [t for t in SYLLABLE_DATA if t['id'] not in st.session_state.completed_syllables]
-    
-    if not incomplete:
+    if progress.complete:
         st.success("You've mastered all words! 🎉")
         if st.button("Start Over"):
-            st.session_state.completed_syllables = []
+            reset_activity("syllables")
             st.rerun()
         return
 
-    task = incomplete[0]
+    task_index = state.current()
+    task = SYLLABLE_DATA[task_index]
     
     # Layout Separation: Word & Instructions vs Input Box
-    st.markdown(f"<div style='text-align:center; font-size:3rem; color:#003366; font-weight:bold; margin-bottom:1rem;'>{task['word']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div style='text-align:center; font-size:3rem; color:#003366; font-weight:bold; margin-bottom:1rem;'>{task.word}</div>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center;'>Break the word into parts below. Keep the suffix (-able/-ible) together!</p>", unsafe_allow_html=True)
     
     # Distinct Input Container
     
-    cols = st.columns(len(task['correctSyllables']))
+    cols = st.columns(len(task.correct_syllables))
     user_inputs = []
     
-    with st.form(key=f"syllable_form_{task['id']}"):
+    with st.form(key=f"syllable_form_{task.id}"):
         for i, col in enumerate(cols):
             # Using label_visibility="collapsed" to make it cleaner, visual instructions above
-            val = col.text_input(f"Syllable {i+1}", key=f"syl_{task['id']}_{i}", label_visibility="visible").strip().lower()
+            val = col.text_input(f"Syllable {i+1}", key=f"syl_{task.id}_{i}", label_visibility="visible").strip().lower()
             user_inputs.append(val)
         
         st.markdown("<br>", unsafe_allow_html=True)
         submitted = st.form_submit_button("Check Answer")
 
     if submitted:
-        if user_inputs == task['correctSyllables']:
+        if user_inputs == list(task.correct_syllables):
+            log_answer("syllables", state, task.id, True)
             celebrate_success()
-            st.session_state.completed_syllables.append(task['id'])
-            
-            # AI Explanation
-            with st.spinner("Asking the AI Wizard for a tip..."):
-                expl = ask_gemini_explanation(task['word'])
-                if expl:
-                    st.success(f"Wizard says: {expl}")
+            state.finish(task_index)
             
-            time.sleep(3)
+            # AI Explanation arrives in the background while the next word renders
+            request_wizard_tip(task.word, task.correct_syllables)
             st.rerun()
         else:
+            log_answer("syllables", state, task.id, False)
             play_error()
+            if handle_miss(state, task_index):
+                st.rerun()
             st.error("Not quite! Check your splits. Is the suffix in one box?")
 
+@REGISTRY.timed("wizard_activity_seconds", activity="wordBuilder")
 def word_builder():
     st.header("🔨 Word Construction Site")
     
@@ -448,114 +591,79 @@ def word_builder():
         st.session_state.wb_difficulty = diff
         st.rerun()
 
-    incomplete = [t for t in WORD_BUILDER_DATA if t['id'] not in st.session_state.completed_words]
+    state = get_activity_state("wordBuilder", len(WORD_BUILDER_DATA))
+    progress = state.progress
     
-    if not incomplete:
+    if progress.complete:
         st.success("All words built! 🏗️")
         if st.button("Reset Construction"):
-            st.session_state.completed_words = []
+            reset_activity("wordBuilder")
             st.rerun()
         return
 
-    task = incomplete[0]
+    task_index = state.current()
+    task = WORD_BUILDER_DATA[task_index]
+    item = state.item_state(task_index)
     
     # ZONE 1: The Workshop (Meaning only)
     st.markdown("### 1. The Blueprint")
-    st.markdown(f"<div class='wb-workshop'><h3>Meaning: {task['meaning']}</h3></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='wb-workshop'><h3>Meaning: {task.meaning}</h3></div>", unsafe_allow_html=True)
     
     # ZONE 2: Parts Bin AND Build Display
     st.markdown("### 2. Construction Zone")
     
-    # State Build
-    if 'wb_current_build' not in st.session_state:
-        st.session_state.wb_current_build = []
-    
-    current_word = "".join(st.session_state.wb_current_build) if st.session_state.wb_current_build else "?"
-    
-    # Shuffle parts
-    parts = task['parts'].copy()
-    if st.session_state.wb_difficulty == 'challenge':
-        all_parts = [p for t in WORD_BUILDER_DATA for p in t['parts']]
-        distractors = random.sample(all_parts, 3)
-        parts.extend(distractors)
-    random.seed(task['id'] + len(parts)) 
-    random.shuffle(parts)
-
-    # Start Yellow Box
-    st.markdown('<div class="wb-parts-bin">', unsafe_allow_html=True)
-    
-    # The Word Being Built (Inside Yellow Box)
-    st.markdown(f"<div class='built-word-display'>{current_word}</div>", unsafe_allow_html=True)
-    st.markdown("<p><b>Click parts to add them:</b></p>", unsafe_allow_html=True)
-    
-    # Buttons
-    b_cols = st.columns(len(parts))
-    for i, part in enumerate(parts):
-        if b_cols[i].button(part, key=f"btn_{task['id']}_{i}_{len(st.session_state.wb_current_build)}", use_container_width=True):
-            st.session_state.wb_current_build.append(part)
-            st.rerun()
-            
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # ZONE 3: Control Panel
-    st.markdown('<div class="wb-controls">', unsafe_allow_html=True)
-    c1, c2, c3 = st.columns([1, 1, 1])
-    
-    with c1:
-        if st.button("↺ Reset Word", use_container_width=True):
-            st.session_state.wb_current_build = []
+    # Shuffle parts once per word (and mode); later reruns reuse the stored layout
+    mode = st.session_state.wb_difficulty
+    if item.get("mode") != mode:
+        rng = st.session_state.rng
+        parts = list(task.parts)
+        if mode == 'challenge':
+            parts.extend(lesson.distractors(task_index, rng))
+        rng.shuffle(parts)
+        item["mode"], item["parts"] = mode, parts
+        # A fresh component per showing: a word that comes back later must
+        # not see the attempt it was left with
+        item["key"] = f"wb_{task.id}_{secrets.token_hex(4)}"
+
+    # The word is put together in the browser (click/drag, undo, reset);
+    # the script only runs again when Check Answer sends the finished word
+    attempt = build_word(item["parts"], key=item["key"], handled=item.get("attempt"))
+    if attempt and attempt["attempt"] != item.get("attempt"):
+        item["attempt"] = attempt["attempt"]
+        built_word = attempt["word"]
+        if built_word == task.target_word:
+            log_answer("wordBuilder", state, task.id, True)
+            celebrate_success()
+            state.finish(task_index)
             st.rerun()
-            
-    with c3:
-        # Green Primary Button for Check Answer
-        if st.button("✅ Check Answer", key="wb_check_btn", type="primary", use_container_width=True):
-            built_word = "".join(st.session_state.wb_current_build)
-            if built_word == task['targetWord']:
-                celebrate_success()
-                st.session_state.completed_words.append(task['id'])
-                st.session_state.completed_words.append(task['id'])
-                st.session_state.wb_current_build = []
-                time.sleep(2)
-                st.rerun()
-            else:
-                play_error()
-                st.error(f"Try again! You built '{built_word}'")
-                time.sleep(2)
-                st.session_state.wb_current_build = []
+        else:
+            log_answer("wordBuilder", state, task.id, False)
+            play_error()
+            if handle_miss(state, task_index):
                 st.rerun()
-    st.markdown('</div>', unsafe_allow_html=True)
+            queue_feedback("error", f"Try again! You built '{built_word}'")
+            st.rerun()
 
+@st.fragment
+@REGISTRY.timed("wizard_activity_seconds", activity="sentences")
 def sentence_fill():
+    show_feedback()
     st.header("✍️ Sentence Master")
     
-    # Temporary styles to make THESE specific buttons huge and fill text
-    # Ensure font size matches the sentence-display class (2.5rem) and weight matches
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        font-size: 2.5rem !important;
-        font-weight: bold !important;
-        line-height: 1.5 !important;
-        padding: 1.5rem !important;
-        min-height: 120px;
-        width: 100%;
-        white-space: normal; /* Allow word wrap if needed */
-        word-wrap: break-word;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    if st.session_state.sent_index >= len(SENTENCE_DATA):
+    state = get_activity_state("sentences", len(SENTENCE_DATA))
+    progress = state.progress
+    if progress.complete:
         st.success("You have completed all sentences! 🎓")
         if st.button("Start Over"):
-            st.session_state.sent_index = 0
-            st.rerun()
+            reset_activity("sentences")
+            next_card()
         return
 
     # One sentence at a time
-    task = SENTENCE_DATA[st.session_state.sent_index]
+    task_index = state.current()
+    task = SENTENCE_DATA[task_index]
     
-    st.markdown(f"**Sentence {st.session_state.sent_index + 1} of {len(SENTENCE_DATA)}**")
+    st.markdown(f"**Sentence {task_index + 1} of {len(SENTENCE_DATA)}**")
     
     # Check if a choice was just made (stored in session state for this frame)
     # We use a unique key for the activity state logic
@@ -569,7 +677,7 @@ def sentence_fill():
     
     st.markdown(f"""
     <div class="sentence-display">
-        {task['sentencePart1']} {blank_visual} {task['sentencePart2']}
+        {task.sentence_part1} {blank_visual} {task.sentence_part2}
     </div>
     """, unsafe_allow_html=True)
     
@@ -579,87 +687,82 @@ def sentence_fill():
     
     # Left Option
     with col1:
-        opt1 = task['options'][0]
-        if st.button(opt1, key=f"btn_opt1_{task['id']}", use_container_width=True):
-            if opt1 == task['correctOption']:
-                celebrate_success()
-                st.markdown(f"""
+        opt1 = task.options[0]
+        if st.button(opt1, key=f"btn_opt1_{task.id}", use_container_width=True):
+            if opt1 == task.correct_option:
+                log_answer("sentences", state, task.id, True)
+                celebrate_success(html=f"""
                 <div class="sentence-display" style="border: 3px solid #28a745;">
-                    {task['sentencePart1']} <span class='filled-word'>{opt1}</span> {task['sentencePart2']}
+                    {task.sentence_part1} <span class='filled-word'>{opt1}</span> {task.sentence_part2}
                 </div>
-                """, unsafe_allow_html=True)
-                time.sleep(2)
-                st.session_state.sent_index += 1
-                st.rerun()
+                """)
+                state.finish(task_index)
+                next_card()
             else:
+                log_answer("sentences", state, task.id, False)
                 play_error()
+                if handle_miss(state, task_index):
+                    next_card()
                 st.toast(f"'{opt1}' is not correct. Try the other one!", icon="❌")
 
     # Right Option
     with col2:
-        opt2 = task['options'][1]
-        if st.button(opt2, key=f"btn_opt2_{task['id']}", use_container_width=True):
-            if opt2 == task['correctOption']:
-                celebrate_success()
-                st.markdown(f"""
+        opt2 = task.options[1]
+        if st.button(opt2, key=f"btn_opt2_{task.id}", use_container_width=True):
+            if opt2 == task.correct_option:
+                log_answer("sentences", state, task.id, True)
+                celebrate_success(html=f"""
                 <div class="sentence-display" style="border: 3px solid #28a745;">
-                    {task['sentencePart1']} <span class='filled-word'>{opt2}</span> {task['sentencePart2']}
+                    {task.sentence_part1} <span class='filled-word'>{opt2}</span> {task.sentence_part2}
                 </div>
-                """, unsafe_allow_html=True)
-                time.sleep(2)
-                st.session_state.sent_index += 1
-                st.rerun()
+                """)
+                state.finish(task_index)
+                next_card()
             else:
+                log_answer("sentences", state, task.id, False)
                 play_error()
+                if handle_miss(state, task_index):
+                    next_card()
                 st.toast(f"'{opt2}' is not correct. Try the other one!", icon="❌")
 
+@st.fragment
+@REGISTRY.timed("wizard_activity_seconds", activity="antonyms")
 def antonym_activity():
+    show_feedback()
     st.header("🔄 Opposites (Tap to Fill)")
     
-    # CSS for larger buttons specific to this activity
-    st.markdown("""
-    <style>
-    div[data-testid="column"] button {
-        font-size: 1.5rem !important; 
-        padding: 1rem 2rem !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    if st.session_state.ant_index >= len(ANTONYM_DATA):
+    state = get_activity_state("antonyms", len(ANTONYM_DATA))
+    progress = state.progress
+    if progress.complete:
         st.success("All opposites found! ☯️")
         if st.button("Play Again"):
-            st.session_state.ant_index = 0
-            st.rerun()
+            reset_activity("antonyms")
+            next_card()
         return
 
-    task = ANTONYM_DATA[st.session_state.ant_index]
+    task_index = state.current()
+    task = ANTONYM_DATA[task_index]
     
-    # State Key for randomness stability
-    options_key = f"antonym_options_{task['id']}"
-    state_key = f"antonym_state_{task['id']}" # 'unanswered', 'correct'
-    
-    # Initialize State
-    if options_key not in st.session_state:
+    # Options stay stable while this word is on screen; evicted once it is finished
+    item = state.item_state(task_index)
+    if "options" not in item:
         # Bubble Bank Generation (Stable per question)
-        options = [task['answer']]
-        others = [t['answer'] for t in ANTONYM_DATA if t['answer'] != task['answer']]
-        options.extend(random.sample(others, min(3, len(others))))
-        random.shuffle(options)
-        st.session_state[options_key] = options
-
-    if state_key not in st.session_state:
-        st.session_state[state_key] = "unanswered"
+        options = [task.answer]
+        others = [t.answer for t in ANTONYM_DATA if t.answer != task.answer]
+        options.extend(st.session_state.rng.sample(others, min(3, len(others))))
+        st.session_state.rng.shuffle(options)
+        item["options"] = options
+        item["answer"] = "unanswered" # 'unanswered', 'correct'
 
-    options = st.session_state[options_key]
-    current_state = st.session_state[state_key]
+    options = item["options"]
+    current_state = item["answer"]
 
-    st.markdown(f"**Word {st.session_state.ant_index + 1} of {len(ANTONYM_DATA)}**")
+    st.markdown(f"**Word {task_index + 1} of {len(ANTONYM_DATA)}**")
     
     # -- UI LAYOUT --
     
     # 1. Clue Word (Top)
-    st.markdown(f"<div class='antonym-clue'>{task['clue']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='antonym-clue'>{task.clue}</div>", unsafe_allow_html=True)
     
     # 2. Swap Icon (Middle)
     st.markdown("<div style='text-align:center; font-size: 2.5rem; margin: 10px 0;'>⇄</div>", unsafe_allow_html=True)
@@ -668,7 +771,7 @@ def antonym_activity():
     # Construct HTML first to ensure proper nesting for centering
     answer_html = "<div style='text-align:center; margin-bottom: 2rem;'>"
     if current_state == "correct":
-         answer_html += f"<div class='antonym-answer-box'>{task['answer']}</div>"
+         answer_html += f"<div class='antonym-answer-box'>{task.answer}</div>"
     else:
          answer_html += "<div class='antonym-placeholder'>?</div>"
     answer_html += "</div>"
@@ -682,171 +785,237 @@ def antonym_activity():
         cols = st.columns(len(options))
         for i, opt in enumerate(options):
             # Key uses index 'i' but options list is now STABLE in session state
-            if cols[i].button(opt, key=f"ant_btn_{task['id']}_{i}", use_container_width=True):
-                if opt == task['answer']:
+            if cols[i].button(opt, key=f"ant_btn_{task.id}_{i}", use_container_width=True):
+                if opt == task.answer:
+                    log_answer("antonyms", state, task.id, True)
                     celebrate_success()
-                    st.session_state[state_key] = "correct"
-                    st.rerun()
+                    item["answer"] = "correct"
+                    next_card()
                 else:
+                    log_answer("antonyms", state, task.id, False)
                     play_error()
+                    if handle_miss(state, task_index):
+                        next_card()
     else:
         # Correct State - Show Next Button
         if st.button("Next Word ➡", type="primary"):
-            st.session_state.ant_index += 1
-            st.rerun()
+            state.finish(task_index)
+            next_card()
 
+@st.fragment
+@REGISTRY.timed("wizard_activity_seconds", activity="yesNo")
 def yes_no_activity():
+    show_feedback()
     st.header("👍 Yes or No?")
 
-    # Inject specific styles for MASSIVE buttons in this activity
-    st.markdown("""
-    <style>
-    div.stButton > button {
-        font-size: 3rem !important;
-        padding: 2rem !important;
-        min-height: 150px;
-        margin-top: 20px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    if st.session_state.yn_index >= len(YES_NO_DATA):
+    state = get_activity_state("yesNo", len(YES_NO_DATA))
+    progress = state.progress
+    if progress.complete:
         st.success("You finished the questions! ✅")
         if st.button("Restart"):
-            st.session_state.yn_index = 0
-            st.rerun()
+            reset_activity("yesNo")
+            next_card()
         return
 
-    task = YES_NO_DATA[st.session_state.yn_index]
+    task_index = state.current()
+    task = YES_NO_DATA[task_index]
     
     # Card View
     st.markdown(f"""
     <div style="background:white; padding:3rem; border-radius:15px; text-align:center; box-shadow:0 4px 6px rgba(0,0,0,0.1); margin-bottom:2rem;">
-        <h2 style="color:#003366;">{task['question']}</h2>
+        <h2 style="color:#003366;">{task.question}</h2>
     </div>
     """, unsafe_allow_html=True)
     
     # State to show result
-    if f"yn_answered_{task['id']}" not in st.session_state:
-        st.session_state[f"yn_answered_{task['id']}"] = None
+    item = state.item_state(task_index)
+    item.setdefault("answered", None)
 
-    if st.session_state[f"yn_answered_{task['id']}"] is None:
+    if item["answered"] is None:
         c1, c2 = st.columns(2)
         if c1.button("YES 👍", use_container_width=True):
-            if task['answer'] == True:
+            if task.answer == True:
+                log_answer("yesNo", state, task.id, True)
                 celebrate_success()
-                st.session_state[f"yn_answered_{task['id']}"] = "correct"
+                item["answered"] = "correct"
             else:
+                log_answer("yesNo", state, task.id, False)
                 play_error()
-                st.session_state[f"yn_answered_{task['id']}"] = "wrong"
-            st.rerun()
+                item["answered"] = "wrong"
+            next_card()
             
         if c2.button("NO 👎", use_container_width=True):
-            if task['answer'] == False:
+            if task.answer == False:
+                log_answer("yesNo", state, task.id, True)
                 celebrate_success()
-                st.session_state[f"yn_answered_{task['id']}"] = "correct"
+                item["answered"] = "correct"
             else:
+                log_answer("yesNo", state, task.id, False)
                 play_error()
-                st.session_state[f"yn_answered_{task['id']}"] = "wrong"
-            st.rerun()
+                item["answered"] = "wrong"
+            next_card()
             
     else:
         # Show Feedback and Next Button
-        if st.session_state[f"yn_answered_{task['id']}"] == "correct":
+        if item["answered"] == "correct":
             st.success("Correct Answer!")
         else:
             st.error("Oops! That was incorrect.")
             
         if st.button("Next Question ➡"):
-            st.session_state.yn_index += 1
-            st.rerun()
+            if item["answered"] == "correct" or not handle_miss(state, task_index):
+                state.finish(task_index)
+            next_card()
+
+# Long stories are split into pages of about this many characters; only the page on screen is sent
+STORY_PAGE_CHARS = int(os.environ.get("WIZARD_STORY_PAGE_CHARS", "1800"))
+
+@st.cache_resource(max_entries=64)
+def story_pages(lesson_id, story_id, _story):
+    """(first, end) paragraph ranges, one per page; a paragraph is never split"""
+    pages, first, size = [], 0, 0
+    for i, paragraph in enumerate(_story.paragraphs):
+        if size and size + len(paragraph) > STORY_PAGE_CHARS:
+            pages.append((first, i))
+            first, size = i, 0
+        size += len(paragraph)
+    pages.append((first, len(_story.paragraphs)))
+    return tuple(pages)
+
+@st.cache_resource(max_entries=256)
+def story_page_html(lesson_id, story_id, page, _story):
+    # Built once per process and identical on every rerun: the text size comes from a CSS variable.
+    # Keyed on ids (the story itself is left out of the hash) since the script reruns in a fresh namespace.
+    first, end = story_pages(lesson_id, story_id, _story)[page]
+    title = f"<h3>{_story.title}</h3>" if page == 0 else ""
+    body = "".join(f"<p>{p}</p>" for p in _story.paragraphs[first:end])
+    return f"<div class='story-box'>{title}{body}</div>"
+
+@st.fragment
+def story_text_size():
+    # Dragging the slider reruns just this: one tiny rule changes, the story is not re-sent
+    font_size = st.slider("Adjust Text Size:", min_value=16, max_value=32, value=20)
+    st.markdown(f"<style>.st-key-reading-story {{ --story-font-size: {font_size}px; }}</style>", unsafe_allow_html=True)
 
+@REGISTRY.timed("wizard_activity_seconds", activity="reading")
 def reading_activity():
     st.header("📖 Reading Comprehension")
     
     story = READING_STORIES[st.session_state.reading_story_index]
+    pages = story_pages(lesson.id, story.id, story)
+    page = min(st.session_state.story_page, len(pages) - 1)
     
-    # Font Size Slider
-    font_size = st.slider("Adjust Text Size:", min_value=16, max_value=32, value=20)
+    story_text_size()
     
     col_story, col_quiz = st.columns([2, 1])
     
     with col_story:
-        # Construct the HTML content manually so the style wrapper applies to all text
-        story_html = f"""
-        <div class='story-box' style='font-size:{font_size}px; line-height: 1.6;'>
-            <h3 style='color:#003366; margin-bottom:1rem;'>{story['title']}</h3>
-        """
-        
-        for p in story['paragraphs']:
-            story_html += f"<p style='margin-bottom:1rem;'>{p}</p>"
-            
-        story_html += "</div>"
+        with st.container(key="reading-story"):
+            st.markdown(story_page_html(lesson.id, story.id, page, story), unsafe_allow_html=True)
         
-        st.markdown(story_html, unsafe_allow_html=True)
+        if len(pages) > 1:
+            col_back, col_page, col_next = st.columns([1, 2, 1])
+            col_page.caption(f"Page {page + 1} of {len(pages)}")
+            if col_back.button("◀ Back", disabled=page == 0):
+                st.session_state.story_page = page - 1
+                st.rerun()
+            if col_next.button("Next Page ▶", disabled=page == len(pages) - 1):
+                st.session_state.story_page = page + 1
+                st.rerun()
         
-        # Read Confirmation
-        if not st.session_state.story_is_read:
+        # Read Confirmation, once the last page has been reached
+        if not st.session_state.story_is_read and page == len(pages) - 1:
             st.write("---")
             if st.button("✅ I have read the story"):
                 st.session_state.story_is_read = True
                 st.rerun()
 
     with col_quiz:
-        if not st.session_state.story_is_read:
-            st.info("Please read the story and click the confirmation button to start the quiz.")
-        else:
-            st.markdown("<div class='quiz-box'>", unsafe_allow_html=True)
-            st.markdown("### Quiz Time!")
-            
-            q_idx = st.session_state.reading_quiz_index
-            
-            if q_idx < len(story['questions']):
-                q = story['questions'][q_idx]
-                st.write(f"**Q{q_idx+1}: {q['question']}**")
-                
-                # Use a placeholder for the answer key to reset on new questions
-                ans_key = f"read_q_{story['id']}_{q_idx}"
-                ans = st.radio("Choose:", q['options'], key=ans_key)
-                
-                if st.button("Check Answer", key=f"chk_{ans_key}"):
-                    if ans == q['correctAnswer']:
-                        celebrate_success()
-                        st.success("Correct!")
-                        time.sleep(1.5)
-                        st.session_state.reading_quiz_index += 1
-                        st.rerun()
-                    else:
-                        play_error()
+        reading_quiz(story)
+
+@st.fragment
+@REGISTRY.timed("wizard_activity_seconds", activity="readingQuiz")
+def reading_quiz(story):
+    # Answering reruns only this column; the story text stays put
+    show_feedback()
+    if not st.session_state.story_is_read:
+        st.info("Please read the story and click the confirmation button to start the quiz.")
+        return
+
+    st.markdown("<div class='quiz-box'>", unsafe_allow_html=True)
+    st.markdown("### Quiz Time!")
+    
+    # Progress through this story's questions
+    state = get_activity_state("reading", len(story.questions))
+    q_idx = state.current()
+    
+    if q_idx is not None:
+        q = story.questions[q_idx]
+        st.write(f"**Q{q_idx+1}: {q.question}**")
+        
+        # Use a placeholder for the answer key to reset on new questions
+        ans_key = f"read_q_{story.id}_{q_idx}"
+        ans = st.radio("Choose:", q.options, key=ans_key)
+        
+        if st.button("Check Answer", key=f"chk_{ans_key}"):
+            if ans == q.correct_answer:
+                log_answer("reading", state, story.id, True, part=q_idx + 1)
+                celebrate_success("Correct!")
+                state.finish(q_idx)
+                next_card()
             else:
-                st.balloons()
-                st.success("Story Completed! 📚")
-                if st.button("Read Next Story"):
-                    st.session_state.reading_story_index = (st.session_state.reading_story_index + 1) % len(READING_STORIES)
-                    st.session_state.reading_quiz_index = 0
-                    st.session_state.story_is_read = False
-                    st.rerun()
-                    
-            st.markdown("</div>", unsafe_allow_html=True)
+                log_answer("reading", state, story.id, False, part=q_idx + 1)
+                play_error()
+                if handle_miss(state, q_idx):
+                    next_card()
+    else:
+        st.balloons()
+        st.success("Story Completed! 📚")
+        if st.button("Read Next Story"):
+            st.session_state.reading_story_index = (st.session_state.reading_story_index + 1) % len(READING_STORIES)
+            reset_activity("reading")
+            st.session_state.story_is_read = False
+            st.session_state.story_page = 0
+            # A new story means new text on the left, so this one reruns the whole page
+            st.rerun()
+            
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Main App Logic ---
 
+wizard_stats_panel()
+
 if st.session_state.current_activity:
     if st.button("← Back to Menu"):
         go_home()
         st.rerun()
 
-if st.session_state.current_activity == "SYLLABLES":
-    syllable_splitter()
-elif st.session_state.current_activity == "WORD_BUILDER":
-    word_builder()
-elif st.session_state.current_activity == "SENTENCE_FILL":
-    sentence_fill()
-elif st.session_state.current_activity == "ANTONYMS":
-    antonym_activity()
-elif st.session_state.current_activity == "YES_NO":
-    yes_no_activity()
-elif st.session_state.current_activity == "READING":
-    reading_activity()
-else:
-    activity_menu()
+# The card activities are fragments and show their own feedback inside the card
+CARD_ACTIVITIES = ("SENTENCE_FILL", "ANTONYMS", "YES_NO", "READING")
+if st.session_state.current_activity not in CARD_ACTIVITIES:
+    show_feedback()
+
+try:
+    if st.session_state.current_activity == "SYLLABLES":
+        syllable_splitter()
+    elif st.session_state.current_activity == "WORD_BUILDER":
+        word_builder()
+    # Keyed containers give activity-specific CSS a class to scope to (st-key-<key>)
+    elif st.session_state.current_activity == "SENTENCE_FILL":
+        with st.container(key="sentence-fill"):
+            sentence_fill()
+    elif st.session_state.current_activity == "ANTONYMS":
+        with st.container(key="antonyms"):
+            antonym_activity()
+    elif st.session_state.current_activity == "YES_NO":
+        with st.container(key="yes-no"):
+            yes_no_activity()
+    elif st.session_state.current_activity == "READING":
+        reading_activity()
+    else:
+        activity_menu()
+finally:
+    # Both also run when st.rerun() cuts the run short
+    save_progress()
+    REGISTRY.observe("wizard_script_run_seconds", time.perf_counter() - run_started,
+                     activity=st.session_state.current_activity or "MENU")
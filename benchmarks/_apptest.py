@@ -0,0 +1,83 @@
+"""Helpers for driving many AppTest sessions from threads in one process.
+
+``AppTest`` installs a mock ``Runtime`` (and swaps ``st.secrets``) around
+every run and tears it down afterwards, which races when several simulated
+students run at once. ``install_shared_runtime`` pins a single mock runtime
+and script cache for the whole process instead - much closer to one real
+server process (and it keeps the script from being compiled concurrently).
+It also points the app's answer log and progress store at a scratch
+directory, so simulated students never show up in the real class data.
+"""
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+import streamlit as st
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT_DIR, "able&ible.py")
+
+
+def install_shared_runtime(secrets=None):
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+    local_script_runner.ScriptCache = lambda: script_cache
+
+    shared = Secrets()
+    shared._secrets = dict(secrets or {"BENCHMARK": "1"})
+    st.secrets = shared
+
+    scratch = tempfile.mkdtemp(prefix="wizard-bench-")
+    os.environ["WIZARD_EVENTS_PATH"] = os.path.join(scratch, "events.bin")
+    os.environ["WIZARD_PROGRESS_PATH"] = os.path.join(scratch, "progress.sqlite3")
+    return runtime
+
+
+def new_session(app_path=DEFAULT_APP, timeout=60):
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    at.run()
+    return at
+
+
+def click(at, label):
+    """Click the first button with this label; False if it is not on screen"""
+    for button in at.button:
+        if button.label == label:
+            button.click().run()
+            return True
+    return False
+
+
+def send_component_value(at, value, index=0):
+    """What a custom component's setComponentValue does: the next run sees `value`.
+
+    AppTest has no handle on custom components, so the value is appended to
+    the widget states of the current tree (replaced by the run it triggers).
+    """
+    element = at.get("component_instance")[index]
+    state = WidgetState(id=element.proto.id, json_value=json.dumps(value))
+    tree = at._tree
+    get_widget_states = tree.get_widget_states
+
+    def with_value():
+        states = get_widget_states()
+        states.widgets.append(state)
+        return states
+
+    tree.get_widget_states = with_value
+    return at
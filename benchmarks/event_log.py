@@ -0,0 +1,90 @@
+"""Answer event log: cost of recording, file size, and aggregation speed.
+
+Writes N synthetic answers (default 2 million: 30 students x 7 items x 6
+activities, over and over) through ``EventLog`` and then aggregates them
+with ``wizard.analytics.item_stats``. For comparison the same statistics
+are computed with a plain per-event Python loop over a 200k-event slice.
+
+    python benchmarks/event_log.py
+    python benchmarks/event_log.py --events 5000000 --out event_log.json
+
+Needs numpy (already a Streamlit dependency).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from wizard.analytics import item_stats, load_events  # noqa: E402
+from wizard.events import ACTIVITY_CODES, EventLog  # noqa: E402
+
+
+def python_loop_stats(events):
+    """The same per-item numbers, one event at a time"""
+    groups = {}
+    for e in events.tolist():
+        _, session, lesson, activity, outcome, part, _, item, latency = e
+        g = groups.setdefault((lesson, activity, part, item), [0, 0, 0.0, set()])
+        g[0] += 1
+        g[1] += outcome
+        g[2] += latency
+        g[3].add(session)
+    return len(groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--out", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="wizard-events-"), "events.bin")
+    log = EventLog(path, linger=0.05, max_batch=5000)
+    rng = random.Random(1)
+    students = [f"student{n}" for n in range(args.students)]
+    activities = list(ACTIVITY_CODES)
+
+    start = time.perf_counter()
+    for n in range(args.events):
+        log.record(students[n % len(students)], "lesson-06", activities[n // 7 % len(activities)],
+                   n % 7 + 1, rng.random() < 0.8, rng.uniform(1, 20))
+    record_us = (time.perf_counter() - start) / args.events * 1e6
+    log.flush(timeout=120)
+    log.close()
+
+    start = time.perf_counter()
+    events = load_events(path)
+    rows = item_stats(events)
+    aggregate_s = time.perf_counter() - start
+
+    sample = events[:200_000]
+    start = time.perf_counter()
+    python_loop_stats(sample)
+    loop_s = (time.perf_counter() - start) * len(events) / len(sample)
+
+    report = {
+        "events": len(events),
+        "bytes_per_event": round((os.path.getsize(path) - 8) / len(events), 1),
+        "file_mb": round(os.path.getsize(path) / 2**20, 1),
+        "record_us_per_event": round(record_us, 2),
+        "batches": log.batches,
+        "items": len(rows),
+        "aggregate_seconds": round(aggregate_s, 3),
+        "python_loop_seconds_extrapolated": round(loop_s, 2),
+    }
+    os.remove(path)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
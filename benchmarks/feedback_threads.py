@@ -0,0 +1,89 @@
+"""How many Streamlit script threads are busy at once while a class works.
+
+Simulates N students (default 30) working through Sentence Master at the
+same time - each pausing a few seconds to think between answers - and samples
+how many ``ScriptRunner.scriptThread`` threads are alive. Blocking ``time.sleep`` feedback shows up as many threads pinned at
+once; the timed feedback state should keep the count near zero.
+
+    python benchmarks/feedback_threads.py
+    python benchmarks/feedback_threads.py --app /path/to/old/able\\&ible.py --students 30
+
+Needs ``streamlit`` installed. Gemini is never called (no API key is set).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from _apptest import DEFAULT_APP, click, install_shared_runtime, new_session
+
+SCRIPT_THREAD = "ScriptRunner.scriptThread"
+
+
+def student(app_path, clicks, think, errors):
+    try:
+        time.sleep(random.uniform(0, think))
+        at = new_session(app_path)
+        click(at, "✍️ Sentence Master")
+        for _ in range(clicks):
+            time.sleep(random.uniform(0.5 * think, 1.5 * think))
+            # In Lesson 6 the right choice is always the -able/-ible word
+            answer = [b.label for b in at.button if b.label.endswith(("able", "ible"))]
+            if not answer:
+                break
+            click(at, answer[0])
+    except Exception as e:
+        errors.append(repr(e))
+
+
+def sample(stop, samples, interval):
+    while not stop.is_set():
+        samples.append(sum(1 for t in threading.enumerate() if t.name == SCRIPT_THREAD))
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--clicks", type=int, default=7, help="answers per student")
+    parser.add_argument("--think", type=float, default=3.0, help="mean pause between answers (s)")
+    parser.add_argument("--interval", type=float, default=0.005, help="sampling interval (s)")
+    args = parser.parse_args()
+
+    install_shared_runtime()
+    samples, errors = [], []
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample, args=(stop, samples, args.interval), daemon=True)
+    students = [
+        threading.Thread(target=student, args=(args.app, args.clicks, args.think, errors))
+        for _ in range(args.students)
+    ]
+
+    start = time.perf_counter()
+    sampler.start()
+    for t in students:
+        t.start()
+    for t in students:
+        t.join()
+    wall = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+
+    busy = [n for n in samples if n]
+    print(json.dumps({
+        "app": args.app,
+        "students": args.students,
+        "clicks_per_student": args.clicks,
+        "think_seconds": args.think,
+        "wall_seconds": round(wall, 2),
+        "peak_busy_script_threads": max(samples, default=0),
+        "mean_busy_script_threads": round(sum(samples) / len(samples), 2) if samples else 0,
+        "busy_sample_ratio": round(len(busy) / len(samples), 3) if samples else 0,
+        "errors": errors[:5],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Full-script executions per completed item, for each activity.
+
+AppTest always reruns the whole script, but a browser tells the server which
+fragment a clicked widget lives in and only that fragment is re-executed.
+This replays the same thing: every delta's fragment id is recorded, and a
+click on a widget inside a fragment is sent as a fragment-scoped rerun.
+Full runs are read from the app's own ``reruns`` session counter.
+
+    python benchmarks/fragment_reruns.py
+    python benchmarks/fragment_reruns.py --app /path/to/old/able\\&ible.py
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import local_script_runner
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from _apptest import DEFAULT_APP, ROOT_DIR, click, install_shared_runtime, new_session
+
+sys.path.insert(0, ROOT_DIR)
+from wizard.lessons import LESSONS_DIR, LessonCatalog  # noqa: E402
+
+widget_fragments = {}  # widget id -> fragment id it was rendered in
+pending = {}  # extra RerunData fields for the next run
+runs = {"script": 0}
+
+
+def replay_fragment_reruns():
+    original_forward_msgs = LocalScriptRunner.forward_msgs
+
+    def forward_msgs(self):
+        msgs = original_forward_msgs(self)
+        for m in msgs:
+            if not m.HasField("delta") or not m.delta.HasField("new_element"):
+                continue
+            element = m.delta.new_element
+            kind = element.WhichOneof("type")
+            widget_id = getattr(getattr(element, kind), "id", None) if kind else None
+            if widget_id:
+                widget_fragments[widget_id] = m.delta.fragment_id
+        return msgs
+
+    def rerun_data(**kwargs):
+        # A fresh runner starts with a full-rerun request that run() coalesces
+        # with, so both need the fragment scope; run()'s request is the last
+        kwargs.update(pending)
+        if "widget_states" in kwargs:
+            pending.clear()
+        return RerunData(**kwargs)
+
+    original_init = LocalScriptRunner.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.on_event.connect(count_starts, weak=False)
+
+    LocalScriptRunner.forward_msgs = forward_msgs
+    LocalScriptRunner.__init__ = init
+    local_script_runner.RerunData = rerun_data
+
+
+def count_starts(sender, event, **kwargs):
+    if event.name == "SCRIPT_STARTED":
+        runs["script"] += 1
+
+
+def press(at, widget):
+    """Interact like a browser would: scope the rerun to the widget's fragment"""
+    fragment_id = widget_fragments.get(widget.id)
+    if fragment_id:
+        pending.update(fragment_id_queue=[fragment_id], is_fragment_scoped_rerun=True)
+    widget.run()
+
+
+def button(at, label):
+    for b in at.button:
+        if b.label == label:
+            return b.click()
+    raise LookupError(f"no button {label!r}")
+
+
+def flows(lesson):
+    def sentences(at):
+        for task in lesson.sentences:
+            press(at, button(at, task.correct_option))
+
+    def antonyms(at):
+        for task in lesson.antonyms:
+            press(at, button(at, task.answer))
+            press(at, button(at, "Next Word ➡"))
+
+    def yes_no(at):
+        for task in lesson.yes_no:
+            press(at, button(at, "YES 👍" if task.answer else "NO 👎"))
+            press(at, button(at, "Next Question ➡"))
+
+    def reading(at):
+        for story in lesson.stories:
+            press(at, button(at, "✅ I have read the story"))
+            for q in story.questions:
+                press(at, at.radio(key=f"read_q_{story.id}_{story.questions.index(q)}").set_value(q.correct_answer))
+                press(at, button(at, "Check Answer"))
+            press(at, button(at, "Read Next Story"))
+
+    return {
+        "sentences": ("✍️ Sentence Master", sentences, len(lesson.sentences)),
+        "antonyms": ("🔄 Opposites", antonyms, len(lesson.antonyms)),
+        "yesNo": ("👍 Yes or No?", yes_no, len(lesson.yes_no)),
+        "reading": ("📖 Reading Comp", reading, sum(len(s.questions) for s in lesson.stories)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--lessons-dir", default=LESSONS_DIR)
+    parser.add_argument("--out", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    catalog = LessonCatalog(args.lessons_dir)
+    lesson = catalog.load(catalog.default_id)
+    os.environ["WIZARD_LESSONS_DIR"] = args.lessons_dir
+    os.environ["WIZARD_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="wizard-frag-"), "cache.sqlite3")
+    install_shared_runtime()
+    replay_fragment_reruns()
+
+    report = {"app": args.app, "lesson": lesson.id, "activities": {}}
+    for name, (menu_button, flow, items) in flows(lesson).items():
+        at = new_session(args.app)
+        click(at, menu_button)
+        full_before, script_before = at.session_state["reruns"], runs["script"]
+        flow(at)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        full = at.session_state["reruns"] - full_before
+        executions = runs["script"] - script_before
+        report["activities"][name] = {
+            "items": items,
+            "full_runs": full,
+            "fragment_runs": executions - full,
+            "full_runs_per_item": round(full / items, 3) if items else None,
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Concurrent-classroom load test built on Streamlit's AppTest.
+
+Drives N simulated students at once through every activity of a lesson -
+syllable split, word builder (normal and challenge), sentence fill,
+antonyms, yes/no and reading - against a stubbed Gemini, then reports:
+
+* rerun latency p50 / p95 / p99 (overall and per activity)
+* reruns per completed item
+* peak RSS growth per session
+
+Results are written as JSON so runs can be diffed between releases::
+
+    python benchmarks/load_test.py --students 30 --out load-$(git rev-parse --short HEAD).json
+
+Needs ``streamlit`` installed; the real Gemini SDK is never imported.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+
+from _apptest import DEFAULT_APP, ROOT_DIR, install_shared_runtime, new_session, send_component_value
+
+sys.path.insert(0, ROOT_DIR)
+from wizard.lessons import LESSONS_DIR, LessonCatalog  # noqa: E402
+
+ACTIVITY_BUTTONS = {
+    "syllables": "✂️ Syllable Split",
+    "wordBuilder": "🔨 Word Builder",
+    "sentences": "✍️ Sentence Master",
+    "antonyms": "🔄 Opposites",
+    "yesNo": "👍 Yes or No?",
+    "reading": "📖 Reading Comp",
+}
+
+
+def install_fake_gemini(latency):
+    """Stand-in for google.generativeai that answers after `latency` seconds"""
+    import google
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    class GenerativeModel:
+        def __init__(self, name):
+            self.name = name
+
+        def generate_content(self, prompt, stream=False, **kwargs):
+            text = f"Stub tip ({len(prompt)} chars of prompt)"
+            if stream:
+                return self._stream(text.split(" "))
+            time.sleep(latency)
+            return Response(text)
+
+        def _stream(self, words):
+            # First token after a fifth of the latency, the rest spread over the remainder
+            time.sleep(latency / 5)
+            for n, word in enumerate(words):
+                if n:
+                    time.sleep(latency * 4 / 5 / (len(words) - 1))
+                yield Response(word + " " if n < len(words) - 1 else word)
+
+        def count_tokens(self, text):
+            return None
+
+    fake = types.ModuleType("google.generativeai")
+    fake.configure = lambda **kwargs: None
+    fake.GenerativeModel = GenerativeModel
+    google.generativeai = fake
+    sys.modules["google.generativeai"] = fake
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2) if values else None,
+        "p95_ms": round(percentile(values, 95) * 1000, 2) if values else None,
+        "p99_ms": round(percentile(values, 99) * 1000, 2) if values else None,
+        "max_ms": round(max(values) * 1000, 2) if values else None,
+    }
+
+
+def rss_peak_bytes():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Student:
+    """One simulated student: an AppTest session plus timing bookkeeping"""
+
+    def __init__(self, app_path, lesson, think):
+        self.app_path = app_path
+        self.lesson = lesson
+        self.think = think
+        self.latencies = {}
+        self.items = {}
+        self.errors = []
+        self.activity = None
+
+    def run(self, element=None):
+        if self.think:
+            time.sleep(self.think)
+        start = time.perf_counter()
+        if element is None:
+            self.at.run()
+        else:
+            element.run()
+        self.latencies.setdefault(self.activity, []).append(time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def click(self, label):
+        for button in self.at.button:
+            if button.label == label:
+                return self.run(button.click())
+        raise LookupError(f"no button {label!r} in {self.activity}")
+
+    def done(self, n=1):
+        self.items[self.activity] = self.items.get(self.activity, 0) + n
+
+    def enter(self, activity, name=None):
+        self.activity = name or activity
+        self.at = new_session(self.app_path)
+        self.click(ACTIVITY_BUTTONS[activity])
+
+    # --- one flow per activity ---
+
+    def syllables(self):
+        self.enter("syllables")
+        for task in self.lesson.syllables:
+            for i, part in enumerate(task.correct_syllables):
+                self.at.text_input[i].input(part)
+            self.click("Check Answer")
+            self.done()
+
+    def word_builder(self, mode):
+        self.enter("wordBuilder", f"wordBuilder:{mode}")
+        if mode == "challenge":
+            self.run(self.at.radio[0].set_value("challenge"))
+        # The word is built in the browser; only Check Answer reaches the server
+        for task in self.lesson.word_builder:
+            self.run(send_component_value(self.at, {"word": task.target_word, "attempt": task.id}))
+            self.done()
+
+    def sentences(self):
+        self.enter("sentences")
+        for task in self.lesson.sentences:
+            self.click(task.correct_option)
+            self.done()
+
+    def antonyms(self):
+        self.enter("antonyms")
+        for task in self.lesson.antonyms:
+            self.click(task.answer)
+            self.click("Next Word ➡")
+            self.done()
+
+    def yes_no(self):
+        self.enter("yesNo")
+        for task in self.lesson.yes_no:
+            self.click("YES 👍" if task.answer else "NO 👎")
+            self.click("Next Question ➡")
+            self.done()
+
+    def reading(self):
+        self.enter("reading")
+        for story in self.lesson.stories:
+            self.click("✅ I have read the story")
+            for q in story.questions:
+                self.run(self.at.radio[0].set_value(q.correct_answer))
+                self.click("Check Answer")
+                self.done()
+            self.click("Read Next Story")
+
+    def work(self):
+        flows = [
+            (self.lesson.syllables, self.syllables),
+            (self.lesson.word_builder, lambda: self.word_builder("normal")),
+            (self.lesson.word_builder, lambda: self.word_builder("challenge")),
+            (self.lesson.sentences, self.sentences),
+            (self.lesson.antonyms, self.antonyms),
+            (self.lesson.yes_no, self.yes_no),
+            (self.lesson.stories, self.reading),
+        ]
+        for items, flow in flows:
+            if not items:
+                continue
+            try:
+                flow()
+            except Exception as e:
+                self.errors.append(f"{self.activity}: {e!r}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--students", type=int, default=10)
+    parser.add_argument("--lessons-dir", default=LESSONS_DIR)
+    parser.add_argument("--think", type=float, default=0.0, help="pause before every interaction (s)")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="stubbed Gemini response time (s)")
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    catalog = LessonCatalog(args.lessons_dir)
+    lesson = catalog.load(catalog.default_id)
+
+    scratch = tempfile.mkdtemp(prefix="wizard-load-")
+    os.environ["API_KEY"] = "stub"
+    os.environ["WIZARD_LESSONS_DIR"] = args.lessons_dir
+    os.environ["WIZARD_CACHE_PATH"] = os.path.join(scratch, "explanations.sqlite3")
+    install_fake_gemini(args.gemini_latency)
+    install_shared_runtime()
+
+    # Warm-up session so one-off imports and caches don't count against students
+    new_session(args.app)
+    rss_before = rss_peak_bytes()
+
+    students = [Student(args.app, lesson, args.think) for _ in range(args.students)]
+    threads = [threading.Thread(target=s.work, name=f"student-{i}") for i, s in enumerate(students)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    rss_after = rss_peak_bytes()
+
+    per_activity = {}
+    for s in students:
+        for activity, values in s.latencies.items():
+            entry = per_activity.setdefault(activity, {"latencies": [], "items": 0})
+            entry["latencies"].extend(values)
+            entry["items"] += s.items.get(activity, 0)
+    all_latencies = [v for entry in per_activity.values() for v in entry["latencies"]]
+    total_items = sum(entry["items"] for entry in per_activity.values())
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "streamlit": __import__("streamlit").__version__,
+            "lesson": lesson.id,
+            "students": args.students,
+            "think_seconds": args.think,
+            "gemini_latency_seconds": args.gemini_latency,
+        },
+        "wall_seconds": round(wall, 2),
+        "reruns": summarize(all_latencies),
+        "reruns_per_item": round(len(all_latencies) / total_items, 3) if total_items else None,
+        "items_completed": total_items,
+        "peak_rss_mb": round(rss_after / 2**20, 1),
+        "peak_rss_growth_per_session_kb": round((rss_after - rss_before) / 1024 / max(1, args.students), 1),
+        "activities": {
+            activity: dict(
+                summarize(entry["latencies"]),
+                items=entry["items"],
+                reruns_per_item=round(len(entry["latencies"]) / entry["items"], 3) if entry["items"] else None,
+            )
+            for activity, entry in sorted(per_activity.items())
+        },
+        "errors": [e for s in students for e in s.errors][:20],
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
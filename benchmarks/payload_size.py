@@ -0,0 +1,70 @@
+"""Bytes sent to the browser per rerun, screen by screen.
+
+Runs the app once per screen (menu plus the first card of every activity)
+and sums the serialized size of the ForwardMsgs the script produced - the
+delta payload a rerun pushes over the websocket, before compression.
+
+    python benchmarks/payload_size.py
+    python benchmarks/payload_size.py --app /path/to/old/able\\&ible.py --inline-css
+"""
+import argparse
+import json
+
+from streamlit import config
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from _apptest import DEFAULT_APP, click, install_shared_runtime, new_session
+
+SCREENS = {
+    "menu": None,
+    "syllables": "✂️ Syllable Split",
+    "wordBuilder": "🔨 Word Builder",
+    "sentences": "✍️ Sentence Master",
+    "antonyms": "🔄 Opposites",
+    "yesNo": "👍 Yes or No?",
+    "reading": "📖 Reading Comp",
+}
+
+last_run_bytes = []
+
+
+def record_forward_msgs():
+    original = LocalScriptRunner.forward_msgs
+
+    def forward_msgs(self):
+        msgs = original(self)
+        last_run_bytes.append(sum(m.ByteSize() for m in msgs if m.HasField("delta")))
+        return msgs
+
+    LocalScriptRunner.forward_msgs = forward_msgs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--inline-css", action="store_true", help="run with server.enableStaticServing off")
+    parser.add_argument("--out", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    config.set_option("server.enableStaticServing", not args.inline_css)
+    install_shared_runtime()
+    record_forward_msgs()
+
+    report = {"app": args.app, "static_serving": not args.inline_css, "delta_bytes_per_rerun": {}}
+    for screen, button in SCREENS.items():
+        at = new_session(args.app)
+        if button:
+            click(at, button)
+        report["delta_bytes_per_rerun"][screen] = last_run_bytes[-1]
+    sizes = report["delta_bytes_per_rerun"].values()
+    report["mean_delta_bytes"] = round(sum(sizes) / len(sizes))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Memory used by N worker processes with and without the shared content store.
+
+Generates a synthetic catalog (lesson packs plus pregenerated explanations),
+then starts N processes that each load every lesson and look up every
+explanation - either privately (LessonCatalog + load_explanations, what a
+plain worker does) or through one mmapped ``wizard.shared.SharedStore``.
+All workers stay alive together while PSS (proportional set size, which
+splits shared pages between the processes using them) is read from
+/proc/<pid>/smaps_rollup, so the totals are real memory. Linux only.
+
+The saving comes from the explanations; every worker still parses its own
+copy of each lesson in both modes.
+
+    python benchmarks/shared_memory.py --workers 4 --lessons 20 --explanations 50000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from _apptest import ROOT_DIR
+
+sys.path.insert(0, ROOT_DIR)
+from wizard.cache import make_key  # noqa: E402
+from wizard.gemini import GEMINI_MODEL, explanation_prompt  # noqa: E402
+from wizard.lessons import EXPLANATIONS_FILE, build_catalog  # noqa: E402
+
+
+def pss_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def make_content(directory, n_lessons, items, n_explanations):
+    for n in range(n_lessons):
+        words = [f"word{n}x{i}able" for i in range(items)]
+        pack = {
+            "format": 1,
+            "id": f"lesson-{n:02d}",
+            "title": f"Lesson {n}",
+            "focus": ["-able", "-ible"],
+            "activities": {
+                "syllables": [{"id": i, "word": w, "correctSyllables": [w[:-4], "able"]} for i, w in enumerate(words)],
+                "wordBuilder": [{"id": i, "parts": [w[:-4], "able"], "meaning": f"meaning of {w}", "targetWord": w}
+                                for i, w in enumerate(words)],
+                "antonyms": [{"id": i, "clue": f"not {w}", "answer": w} for i, w in enumerate(words)],
+            },
+        }
+        with open(os.path.join(directory, f"lesson-{n:02d}.json"), "w") as f:
+            json.dump(pack, f)
+    build_catalog(directory)
+    entries = {}
+    for i in range(n_explanations):
+        word = f"word{i}ible"
+        text = f"'{word}' keeps -ible because its root is not a whole word on its own. " * 3
+        entries[make_key(GEMINI_MODEL, explanation_prompt(word))] = {"word": word, "text": text}
+    with open(os.path.join(directory, EXPLANATIONS_FILE), "w") as f:
+        json.dump({"format": 1, "model": GEMINI_MODEL, "explanations": entries}, f)
+    return list(entries)
+
+
+def worker(mode, directory, store_path, keys, ready, done, results):
+    before = pss_kb()
+    try:
+        if mode == "shared":
+            from wizard.shared import SharedStore
+            store = SharedStore(store_path)
+            catalog, explanations = store, store
+        else:
+            from wizard.explanations import load_explanations
+            from wizard.lessons import LessonCatalog
+            catalog = LessonCatalog(directory)
+            explanations = load_explanations(os.path.join(directory, EXPLANATIONS_FILE))
+        lessons = [catalog.load(e.id) for e in catalog.entries]
+        hits = sum(1 for key in keys if explanations.get(key) is not None)
+    except BaseException:
+        ready.abort()
+        raise
+    ready.wait()  # everyone loaded: now measure with all workers alive
+    results.put({"mode": mode, "pss_kb": pss_kb(), "growth_kb": pss_kb() - before,
+                 "lessons": len(lessons), "hits": hits})
+    done.wait()
+
+
+def run(mode, workers, directory, store_path, keys):
+    ctx = multiprocessing.get_context("spawn")
+    ready, done, results = ctx.Barrier(workers + 1), ctx.Barrier(workers + 1), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, directory, store_path, keys, ready, done, results))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    ready.wait()
+    reports = [results.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    return {
+        "total_pss_mb": round(sum(r["pss_kb"] for r in reports) / 1024, 1),
+        "content_pss_mb_per_worker": round(sum(r["growth_kb"] for r in reports) / 1024 / workers, 1),
+        "hits_per_worker": reports[0]["hits"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lessons", type=int, default=20)
+    parser.add_argument("--items", type=int, default=200, help="items per activity per lesson")
+    parser.add_argument("--explanations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    from wizard.shared import publish
+
+    directory = tempfile.mkdtemp(prefix="wizard-shared-")
+    keys = make_content(directory, args.lessons, args.items, args.explanations)
+    store_path = os.path.join(directory, "shared.bin")
+    published = publish(store_path, directory, os.path.join(directory, "no-cache.sqlite3"))
+    report = {
+        "workers": args.workers,
+        "store_mb": round(published["bytes"] / 2**20, 1),
+        "private": run("private", args.workers, directory, store_path, keys),
+        "shared": run("shared", args.workers, directory, store_path, keys),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
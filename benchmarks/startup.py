@@ -0,0 +1,96 @@
+"""Cold-start benchmark: time from a fresh interpreter to the first paint.
+
+Each sample runs in a new ``python -X importtime`` process that imports
+Streamlit, runs the app once to the activity menu and exits. We report the
+time to first paint plus the slowest imports, and check that the Gemini SDK
+was *not* imported on the way.
+
+    python benchmarks/startup.py --repeat 5 --out startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from _apptest import DEFAULT_APP
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.secrets["BENCHMARK"] = "1"
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "streamlit_import_seconds": t1 - t0,
+    "first_paint_seconds": t2 - t0,
+    "exception": bool(at.exception),
+    "gemini_sdk_loaded": "google.generativeai" in sys.modules,
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """{module: cumulative seconds} for imports made directly by the probe or the app"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2]
+        # Nested imports are indented by two spaces per level
+        if len(name) - len(name.lstrip()) > 1:
+            continue
+        cumulative[name.strip()] = int(fields[1]) / 1e6
+    return cumulative
+
+
+def sample(app_path):
+    env = dict(os.environ)
+    env.pop("API_KEY", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, app_path],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--out", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    samples = [sample(args.app) for _ in range(args.repeat)]
+    top_level = samples[-1]["imports"]
+    report = {
+        "app": args.app,
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "first_paint_seconds_median": round(statistics.median(s["first_paint_seconds"] for s in samples), 4),
+        "streamlit_import_seconds_median": round(statistics.median(s["streamlit_import_seconds"] for s in samples), 4),
+        "gemini_sdk_loaded": any(s["gemini_sdk_loaded"] for s in samples),
+        "app_exception": any(s["exception"] for s in samples),
+        "slowest_top_level_imports": dict(
+            sorted(((k, round(v, 4)) for k, v in top_level.items()), key=lambda kv: -kv[1])[: args.top]
+        ),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
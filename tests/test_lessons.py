@@ -0,0 +1,46 @@
+"""Packs that parse must also fit the answer log's record fields.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from wizard.events import pack_event  # noqa: E402
+from wizard.lessons import LessonPackError, parse_pack  # noqa: E402
+
+
+def pack(**activities):
+    return {"format": 1, "id": "lesson-x", "title": "X", "activities": activities}
+
+
+def yes_no(item_id):
+    return {"id": item_id, "question": "Is it?", "answer": True}
+
+
+def story(questions):
+    question = {"question": "Why?", "options": ["a", "b"], "correctAnswer": "a"}
+    return {"id": 1, "title": "T", "paragraphs": ["p"], "questions": [question] * questions}
+
+
+@pytest.mark.parametrize("item_id", ["q1", -1, 2**32, 1.5, True, None])
+def test_bad_item_ids_are_rejected(item_id):
+    with pytest.raises(LessonPackError, match="item id"):
+        parse_pack(pack(yesNo=[yes_no(item_id)]))
+
+
+def test_story_question_limit():
+    lesson = parse_pack(pack(reading=[story(255)]))
+    # The last question still fits the log's part field
+    pack_event(1, lesson.id, "reading", lesson.stories[0].id, True, 1.0, part=255)
+    with pytest.raises(LessonPackError, match="255 questions"):
+        parse_pack(pack(reading=[story(256)]))
+
+
+def test_accepted_ids_fit_the_log():
+    lesson = parse_pack(pack(yesNo=[yes_no(0), yes_no(2**32 - 1)]))
+    for item in lesson.yes_no:
+        pack_event(1, lesson.id, "yesNo", item.id, True, 1.0)
@@ -0,0 +1,99 @@
+"""Session state stays bounded however large the item bank is.
+
+A student plays a generated 500-item pack to the end; the pickled size of
+what the session keeps (and, through the app, its number of keys) must not
+grow with the number of items played. The app-level test drives the real
+script through AppTest (skipped without Streamlit) and takes about a minute.
+
+    python -m pytest tests
+"""
+import json
+import os
+import pickle
+import random
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from wizard.lessons import build_catalog  # noqa: E402
+from wizard.progress import ActivityState  # noqa: E402
+
+ITEMS = 500
+
+
+def size(obj):
+    return len(pickle.dumps(obj))
+
+
+def test_activity_state_is_bounded():
+    state = ActivityState(ITEMS, pack="0" * 16)
+    rng = random.Random(1)
+    sizes = {}
+    played = 0
+    while (index := state.current()) is not None:
+        item = state.item_state(index)
+        item["options"] = ["a", "b", "c", "d"]  # scratch, like shuffled choices
+        played += 1
+        if rng.random() < 0.2:
+            state.miss(index)  # comes back later
+        else:
+            state.finish(index)
+            assert state.item == {}  # finished-item scratch is evicted
+        if played in (1, 100, ITEMS):
+            sizes[played] = size(state)
+
+    assert state.progress.complete
+    # Two bitsets of ITEMS / 8 bytes plus a small fixed overhead, never per-item dicts
+    bound = 2 * ITEMS // 8 + 1024
+    assert max(sizes.values()) < bound, sizes
+    assert size(state) < bound
+    assert sizes[ITEMS] - sizes[1] < 2 * ITEMS // 8, sizes
+
+
+def yes_no_pack(items):
+    return {
+        "format": 1,
+        "id": "big",
+        "title": "Big",
+        "activities": {
+            "yesNo": [{"id": n, "question": f"Is {n} even?", "answer": n % 2 == 0} for n in range(1, items + 1)],
+        },
+    }
+
+
+def test_app_session_state_is_bounded(tmp_path, monkeypatch):
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    lessons = tmp_path / "lessons"
+    lessons.mkdir()
+    (lessons / "big.json").write_text(json.dumps(yes_no_pack(ITEMS)), encoding="utf-8")
+    build_catalog(str(lessons))
+    monkeypatch.setenv("WIZARD_LESSONS_DIR", str(lessons))
+    monkeypatch.setenv("WIZARD_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("WIZARD_PROGRESS_PATH", "")
+    monkeypatch.setenv("WIZARD_EVENTS_PATH", "")
+    monkeypatch.delenv("API_KEY", raising=False)
+
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "able&ible.py"), default_timeout=60)
+    at.secrets["BENCHMARK"] = "1"
+    at.run()
+
+    def click(label):
+        next(b for b in at.button if b.label == label).click().run()
+        assert not at.exception, at.exception
+
+    click("👍 Yes or No?")
+    keys, sizes = {}, {}
+    for n in range(1, ITEMS + 1):
+        click("YES 👍" if n % 2 == 0 else "NO 👎")
+        click("Next Question ➡")
+        if n in (1, 100, ITEMS):
+            keys[n] = len(at.session_state)
+            sizes[n] = size(at.session_state["activities"])
+
+    assert any("finished the questions" in s.value for s in at.success)
+    assert keys[1] == keys[100] == keys[ITEMS], keys
+    assert max(sizes.values()) < 2 * ITEMS // 8 + 1024, sizes
@@ -0,0 +1,6 @@
+"""Shared building blocks for the Trident Word Wizards app."""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Local runtime state (explanation cache, progress, answer log, shared store); not in git
+CACHE_DIR = os.path.join(ROOT_DIR, ".wizard_cache")
@@ -0,0 +1,137 @@
+"""Class-level answer statistics from the ``wizard.events`` log.
+
+The log is mapped straight into a NumPy structured array, and every
+statistic is computed with whole-array passes: each answer gets one int64
+item key, a single sort makes every item a contiguous run, and the runs
+are summed with ``np.add.reduceat``. There is no per-event Python loop.
+
+    python -m wizard.analytics                      # hardest items first
+    python -m wizard.analytics --lesson lesson-06 --since 2026-10-01 --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from wizard.content import MAX_LESSON_ID_BYTES
+from wizard.events import ACTIVITY_CODES, DEFAULT_PATH, MAGIC
+
+EVENT_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("session", "<u8"),
+    ("lesson", "S16"),
+    ("activity", "u1"),
+    ("outcome", "u1"),
+    ("part", "u1"),
+    ("pad", "u1"),
+    ("item", "<u4"),
+    ("latency", "<f4"),
+])
+
+
+def load_events(path=DEFAULT_PATH):
+    """The whole log as a read-only structured array (memory-mapped, not copied)"""
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    # A trailing partial record (a write in progress) is left out
+    count = max(0, size - len(MAGIC)) // EVENT_DTYPE.itemsize
+    if not count:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not an answer event log")
+    return np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=len(MAGIC), shape=(count,))
+
+
+def select(events, lesson=None, since=None):
+    mask = np.ones(len(events), dtype=bool)
+    if lesson is not None:
+        mask &= events["lesson"] == lesson.encode("utf-8")
+    if since is not None:
+        mask &= events["ts"] >= since
+    return events[mask]
+
+
+def item_stats(events):
+    """One row per (lesson, activity, item, part), hardest (lowest accuracy) first.
+
+    Time on task is how long the item had been on screen at each answer.
+    """
+    if not len(events):
+        return []
+    # Lesson ids are hashed to one uint64 so grouping never has to sort strings
+    raw = np.ascontiguousarray(events["lesson"]).view("<u8").reshape(-1, 2)
+    lesson_hash = raw[:, 0] ^ (raw[:, 1] * np.uint64(0x9E3779B97F4A7C15))
+    _, first, lesson_codes = np.unique(lesson_hash, return_index=True, return_inverse=True)
+    lessons = events["lesson"][first]
+    keys = (
+        (lesson_codes.astype(np.int64) << 48)
+        | (events["activity"].astype(np.int64) << 40)
+        | (events["part"].astype(np.int64) << 32)
+        | events["item"].astype(np.int64)
+    )
+    # One sort by key; each item is then a contiguous run
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    unique_keys = sorted_keys[starts]
+    attempts = np.diff(np.r_[starts, len(keys)])
+    correct = np.add.reduceat(events["outcome"][order].astype(np.int64), starts)
+    seconds = np.add.reduceat(events["latency"][order].astype(np.float64), starts)
+    # Distinct students per item: unique (run number, top 44 bits of the session hash) pairs.
+    # Fine for up to 2**20 distinct items.
+    run = np.repeat(np.arange(len(starts), dtype=np.uint64), attempts)
+    pairs = np.unique((run << np.uint64(44)) | (events["session"][order] >> np.uint64(20)))
+    students = np.bincount((pairs >> np.uint64(44)).astype(np.int64), minlength=len(starts))
+
+    accuracy = correct / attempts
+    order = np.lexsort((-attempts, accuracy))
+    rows = []
+    for i in order.tolist():
+        key = int(unique_keys[i])
+        rows.append({
+            "lesson": lessons[key >> 48].decode("utf-8"),
+            "activity": ACTIVITY_CODES[(key >> 40) & 0xFF],
+            "item": key & 0xFFFFFFFF,
+            "part": (key >> 32) & 0xFF,
+            "attempts": int(attempts[i]),
+            "students": int(students[i]),
+            "accuracy": round(float(accuracy[i]), 3),
+            "mean_seconds": round(float(seconds[i] / attempts[i]), 2),
+        })
+    return rows
+
+
+def _format(rows):
+    lines = [f"{'lesson':<12} {'activity':<12} {'item':>5} {'q':>2} {'tries':>7} {'kids':>5} {'right':>6} {'secs':>6}"]
+    for r in rows:
+        lines.append(
+            f"{r['lesson']:<12} {r['activity']:<12} {r['item']:>5} {r['part'] or '':>2} {r['attempts']:>7} "
+            f"{r['students']:>5} {r['accuracy']:>6.0%} {r['mean_seconds']:>6.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m wizard.analytics", description="per-item accuracy and time on task")
+    parser.add_argument("--events", default=os.environ.get("WIZARD_EVENTS_PATH") or DEFAULT_PATH)
+    parser.add_argument("--lesson", help="only this lesson id")
+    parser.add_argument("--since", help="only answers on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=20, help="rows to show (0 = all)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    if args.lesson and len(args.lesson.encode("utf-8")) > MAX_LESSON_ID_BYTES:
+        parser.error(f"lesson ids are at most {MAX_LESSON_ID_BYTES} bytes; {args.lesson!r} can't be in the log")
+
+    since = time.mktime(time.strptime(args.since, "%Y-%m-%d")) if args.since else None
+    rows = item_stats(select(load_events(args.events), args.lesson, since))
+    if args.top:
+        rows = rows[:args.top]
+    print(json.dumps(rows, indent=2) if args.json else _format(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Write-behind queue drained in batches by one background thread.
+
+Callers only enqueue, so a click never waits on disk. The writer thread
+takes the first queued item, keeps collecting for up to ``linger`` seconds
+or ``max_batch`` items, and hands the batch to ``_write_batch`` in one go.
+``flush`` waits for everything queued so far; ``close`` (also run at exit)
+writes what is left and stops the thread. Used by ``wizard.store`` and
+``wizard.events``.
+"""
+import atexit
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class BatchWriter:
+    """Subclasses implement ``_write_batch``; ``_open_writer`` / ``_close_writer`` run on the writer thread"""
+
+    def __init__(self, name, linger, max_batch):
+        self.linger = linger
+        self.max_batch = max_batch
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name=name)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _put(self, item):
+        self._queue.put(item)
+
+    def flush(self, timeout=5):
+        """Block until everything queued so far is written"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(5)
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    def _open_writer(self):
+        pass
+
+    def _close_writer(self):
+        pass
+
+    def _write_batch(self, items):
+        raise NotImplementedError
+
+    def _write_loop(self):
+        self._open_writer()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            items = [item for item in batch if item is not _STOP and not isinstance(item, threading.Event)]
+            if items:
+                self._write_batch(items)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if _STOP in batch:
+                self._close_writer()
+                return
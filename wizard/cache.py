@@ -0,0 +1,141 @@
+"""Two-tier cache for AI Wizard explanations.
+
+Tier 1 is a small in-process LRU so repeat tips inside one server are a dict
+lookup. Tier 2 is a SQLite file that survives restarts and is shared by every
+session (and every server process) pointed at the same path.
+
+In front of both sits an optional read-only ``preloaded`` mapping (see
+``wizard.explanations``): pregenerated text that never expires or evicts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from wizard import CACHE_DIR
+
+DEFAULT_PATH = os.path.join(CACHE_DIR, "explanations.sqlite3")
+
+# Prune expired / excess rows every this many writes
+PRUNE_EVERY = 100
+
+
+def make_key(model_name, prompt):
+    """Cache key for one (model, prompt) pair."""
+    return hashlib.sha256(f"{model_name}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    def __init__(self, path=DEFAULT_PATH, memory_size=512, ttl=30 * 24 * 3600, max_rows=50_000, preloaded=None):
+        self.path = path
+        self.preloaded = preloaded or {}
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._writes = 0
+        self.preloaded_hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = self._open(path) if path else None
+
+    def _open(self, path):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS explanations_accessed ON explanations(accessed)")
+            self._prune(db, time.time())
+            return db
+        except sqlite3.Error:
+            # Disk tier is an optimisation; fall back to memory only
+            return None
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, model_name, prompt):
+        key = make_key(model_name, prompt)
+        now = time.time()
+        with self._lock:
+            text = self.preloaded.get(key)
+            if text is not None:
+                self.preloaded_hits += 1
+                return text
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created FROM explanations WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and row[1] + self.ttl > now:
+                        self._db.execute("UPDATE explanations SET accessed = ? WHERE key = ?", (now, key))
+                        self._remember(key, row[0], row[1] + self.ttl)
+                        self.disk_hits += 1
+                        return row[0]
+                except sqlite3.Error:
+                    pass
+
+            self.misses += 1
+            return None
+
+    def put(self, model_name, prompt, value):
+        key = make_key(model_name, prompt)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now + self.ttl)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO explanations (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune(self._db, now)
+            except sqlite3.Error:
+                pass
+
+    def _prune(self, db, now):
+        db.execute("DELETE FROM explanations WHERE created < ?", (now - self.ttl,))
+        db.execute(
+            "DELETE FROM explanations WHERE key IN ("
+            " SELECT key FROM explanations ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def stats(self):
+        with self._lock:
+            hits = self.preloaded_hits + self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "preloaded_hits": self.preloaded_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "preloaded_entries": len(self.preloaded),
+            }
@@ -0,0 +1,113 @@
+"""Lesson content as immutable, process-wide objects.
+
+Everything here is built once per server process and shared read-only by
+every session, so none of it may be mutated at runtime. Packs on disk are
+parsed into these by ``wizard.lessons``.
+"""
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class SyllableItem:
+    id: int
+    word: str
+    correct_syllables: tuple
+
+
+@dataclass(frozen=True)
+class WordBuilderItem:
+    id: int
+    parts: tuple
+    meaning: str
+    target_word: str
+
+
+@dataclass(frozen=True)
+class SentenceItem:
+    id: int
+    sentence_part1: str
+    sentence_part2: str
+    options: tuple
+    correct_option: str
+
+
+@dataclass(frozen=True)
+class AntonymItem:
+    id: int
+    clue: str
+    answer: str
+
+
+@dataclass(frozen=True)
+class YesNoItem:
+    id: int
+    question: str
+    answer: bool
+
+
+@dataclass(frozen=True)
+class ReadingQuestion:
+    question: str
+    options: tuple
+    correct_answer: str
+
+
+@dataclass(frozen=True)
+class ReadingStory:
+    id: int
+    title: str
+    paragraphs: tuple
+    questions: tuple
+
+
+# Field sizes in the answer log (wizard.events) that packs must fit: the lesson
+# id in 16 bytes, item ids in a u32, a reading question number in a u8
+MAX_LESSON_ID_BYTES = 16
+MAX_ITEM_ID = 2**32 - 1
+MAX_STORY_QUESTIONS = 255
+
+# Activity name -> Lesson attribute holding its items
+ACTIVITIES = {
+    "syllables": "syllables",
+    "wordBuilder": "word_builder",
+    "sentences": "sentences",
+    "antonyms": "antonyms",
+    "yesNo": "yes_no",
+    "reading": "stories",
+}
+
+
+@dataclass(frozen=True)
+class Lesson:
+    id: str
+    title: str
+    focus: tuple
+    syllables: tuple
+    word_builder: tuple
+    sentences: tuple
+    antonyms: tuple
+    yes_no: tuple
+    stories: tuple
+    # activity -> digest of its items' identities in order (see wizard.lessons.fingerprint)
+    fingerprints: dict = field(default_factory=dict, compare=False, repr=False)
+    # Every distinct word-builder part, once - the challenge-mode distractor pool
+    parts_pool: tuple = field(default=(), compare=False, repr=False)
+
+    @property
+    def full_title(self):
+        return f"{self.title}: {' & '.join(self.focus)}" if self.focus else self.title
+
+    def distractors(self, position, rng, k=3):
+        """Up to `k` distinct parts for word-builder item `position`, none of them its own"""
+        own = set(self.word_builder[position].parts)
+        pool = self.parts_pool
+        if len(pool) <= len(own) + 2 * k:
+            candidates = [p for p in pool if p not in own]
+            return rng.sample(candidates, min(k, len(candidates)))
+        # Large pool: a few rejected draws beat copying it for every item
+        picked = []
+        while len(picked) < k:
+            part = pool[rng.randrange(len(pool))]
+            if part not in own and part not in picked:
+                picked.append(part)
+        return picked
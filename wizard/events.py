@@ -0,0 +1,97 @@
+"""Append-only log of every answer a student gives.
+
+Each answer is one fixed-size little-endian record, so the file can be read
+back as a NumPy structured array in one call (see ``wizard.analytics``)::
+
+    ts        f8   unix time of the answer
+    session   u8   64-bit hash of the student id (the id itself is not stored)
+    lesson    16s  lesson id, NUL padded (packs keep ids within 16 bytes)
+    activity  u1   index into ACTIVITY_CODES
+    outcome   u1   1 correct, 0 wrong
+    part      u1   question number within the item (reading), else 0
+    (pad)     u1
+    item      u4   item id from the lesson pack (story id for reading)
+    latency   f4   seconds the item had been on screen
+
+The file starts with an 8-byte magic. Like ``wizard.store``, ``record``
+only packs and enqueues; a writer thread appends batches with a single
+``O_APPEND`` write, so a click never waits on disk and several worker
+processes can share one log.
+"""
+import hashlib
+import logging
+import os
+import struct
+import time
+
+from wizard import CACHE_DIR
+from wizard.batching import BatchWriter
+from wizard.content import ACTIVITIES, MAX_LESSON_ID_BYTES
+
+DEFAULT_PATH = os.path.join(CACHE_DIR, "events.bin")
+
+MAGIC = b"WIZEVT01"
+RECORD = struct.Struct("<dQ16sBBBxIf")
+ACTIVITY_CODES = tuple(ACTIVITIES)
+
+log = logging.getLogger("wizard.events")
+
+
+def session_hash(student_id):
+    return int.from_bytes(hashlib.blake2b(student_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def pack_event(session, lesson, activity, item, correct, latency, part=0, ts=None):
+    lesson = lesson.encode("utf-8")
+    if len(lesson) > MAX_LESSON_ID_BYTES:
+        # Cutting it would merge lessons sharing a prefix (and could split a character)
+        raise ValueError(f"lesson id longer than {MAX_LESSON_ID_BYTES} bytes: {lesson!r}")
+    return RECORD.pack(
+        time.time() if ts is None else ts,
+        session,
+        lesson,
+        ACTIVITY_CODES.index(activity),
+        1 if correct else 0,
+        part,
+        item,
+        latency,
+    )
+
+
+def _open(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        os.write(fd, MAGIC)
+        os.close(fd)
+    except FileExistsError:
+        pass
+    return os.open(path, os.O_WRONLY | os.O_APPEND)
+
+
+class EventLog(BatchWriter):
+    def __init__(self, path=DEFAULT_PATH, linger=1.0, max_batch=1000):
+        self.path = path
+        self._fd = _open(path)
+        self.events_written = 0
+        super().__init__("wizard-event-writer", linger, max_batch)
+
+    def record(self, student_id, lesson, activity, item, correct, latency, part=0):
+        self._put(pack_event(session_hash(student_id), lesson, activity, item, correct, latency, part))
+
+    def _close_writer(self):
+        os.close(self._fd)
+
+    def _write_batch(self, records):
+        self._append(b"".join(records), len(records))
+
+    def _append(self, data, count):
+        try:
+            os.write(self._fd, data)
+            self.batches += 1
+            self.events_written += count
+        except OSError as e:
+            log.warning("dropped %d answer event(s): %s", count, e)
+
+    def stats(self):
+        return {"queued": self.queued, "batches": self.batches, "events_written": self.events_written}
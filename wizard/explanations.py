@@ -0,0 +1,189 @@
+"""Pre-generated AI Wizard explanations, shipped next to the lesson packs.
+
+``lessons/explanations.json`` holds one Gemini explanation per lesson word::
+
+    {
+      "format": 1,
+      "model": "gemini-2.5-flash",
+      "generated": "2026-10-18T09:30:00+0000",
+      "explanations": {"<make_key(model, prompt)>": {"word": "...", "text": "..."}}
+    }
+
+Entries are keyed like the explanation cache, so changing the model or the
+prompt wording simply turns old entries into misses. The app loads the file
+once at startup; only words missing from it go to Gemini live. Words the
+local spelling rules already explain (``wizard.rules``) are not generated. Build or
+top it up (already-present words are skipped unless ``--force``) with::
+
+    API_KEY=... python -m wizard.explanations pregenerate --concurrency 4 --rate 2
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from wizard import rules
+from wizard.cache import make_key
+from wizard.gemini import GEMINI_MODEL, GeminiClient, explanation_prompt
+from wizard.lessons import EXPLANATIONS_FILE, LESSONS_DIR, LessonCatalog
+
+FORMAT_VERSION = 1
+DEFAULT_PATH = os.path.join(LESSONS_DIR, EXPLANATIONS_FILE)
+
+log = logging.getLogger("wizard.explanations")
+
+
+def load_explanations(path=DEFAULT_PATH):
+    """{cache key: text} from a pregenerated file; empty if it is missing or unreadable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.warning("ignoring explanations file %s: %s", path, e)
+        return {}
+    if data.get("format") != FORMAT_VERSION:
+        log.warning("ignoring explanations file %s: unsupported format %r", path, data.get("format"))
+        return {}
+    return {key: entry["text"] for key, entry in data.get("explanations", {}).items() if entry.get("text")}
+
+
+def write_explanations(path, model_name, entries):
+    """Atomically write `entries` ({key: {"word", "text"}}) as a versioned file"""
+    data = {
+        "format": FORMAT_VERSION,
+        "model": model_name,
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "explanations": dict(sorted(entries.items(), key=lambda kv: kv[1]["word"])),
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def lesson_words(lesson):
+    """Every word a tip can be asked for: the answers the student produces"""
+    words = [t.word for t in lesson.syllables]
+    words += [t.target_word for t in lesson.word_builder]
+    words += [t.correct_option for t in lesson.sentences]
+    words += [t.answer for t in lesson.antonyms]
+    return words
+
+
+def catalog_words(catalog):
+    seen = {}
+    for entry in catalog.entries:
+        for word in lesson_words(catalog.load(entry.id)):
+            seen.setdefault(word.lower(), word)
+    return sorted(seen.values())
+
+
+class RateLimiter:
+    """Hands out evenly spaced start times: at most `rate` calls per second across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def generate_with_retry(client, prompt, limiter, retries=3, backoff=1.0):
+    """Gemini text for `prompt`, retrying with jittered exponential backoff"""
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            text = client.generate(prompt)
+            if text:
+                return text.strip()
+            error = "empty response"
+        except Exception as e:
+            error = repr(e)
+        if attempt < retries:
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            log.info("retrying in %.1fs after %s", delay, error)
+            time.sleep(delay)
+    raise RuntimeError(f"gave up after {retries + 1} attempts: {error}")
+
+
+def pregenerate(client, words, entries, concurrency=4, rate=2.0, retries=3):
+    """Fill `entries` in place for every word in `words`; returns the words that failed"""
+    limiter = RateLimiter(rate)
+    failed = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="wizard-pregen") as pool:
+        futures = {}
+        for word in words:
+            prompt = explanation_prompt(word)
+            future = pool.submit(generate_with_retry, client, prompt, limiter, retries)
+            futures[future] = (word, make_key(client.model_name, prompt))
+        for n, future in enumerate(as_completed(futures), 1):
+            word, key = futures[future]
+            try:
+                entries[key] = {"word": word, "text": future.result()}
+                print(f"[{n}/{len(futures)}] {word}")
+            except RuntimeError as e:
+                failed.append(word)
+                print(f"[{n}/{len(futures)}] {word}: {e}", file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m wizard.explanations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pre = commands.add_parser("pregenerate", help="generate explanations for every lesson word")
+    pre.add_argument("--lessons-dir", default=LESSONS_DIR)
+    pre.add_argument("--out", help=f"explanations file (default: <lessons-dir>/{EXPLANATIONS_FILE})")
+    pre.add_argument("--model", default=GEMINI_MODEL)
+    pre.add_argument("--concurrency", type=int, default=4, help="Gemini calls in flight at once")
+    pre.add_argument("--rate", type=float, default=2.0, help="max Gemini calls started per second (0 = no limit)")
+    pre.add_argument("--retries", type=int, default=3, help="retries per word after the first attempt")
+    pre.add_argument("--timeout", type=float, default=30.0, help="seconds before a Gemini call counts as failed")
+    pre.add_argument("--force", action="store_true", help="regenerate words that are already in the file")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("API_KEY")
+    if not api_key:
+        parser.error("set API_KEY to a Gemini API key")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    out = args.out or os.path.join(args.lessons_dir, EXPLANATIONS_FILE)
+    client = GeminiClient(api_key, args.model, timeout=args.timeout)
+    entries = {}
+    if not args.force and os.path.exists(out):
+        with open(out, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") == FORMAT_VERSION:
+            entries = data["explanations"]
+
+    words = [w for w in catalog_words(LessonCatalog(args.lessons_dir))
+             if make_key(args.model, explanation_prompt(w)) not in entries]
+    ruled = [w for w in words if rules.explain(w)]
+    words = [w for w in words if w not in ruled]
+    print(f"{len(entries)} explanation(s) already in {out}; {len(ruled)} covered by the spelling rules; "
+          f"generating {len(words)}")
+    failed = pregenerate(client, words, entries, args.concurrency, args.rate, args.retries)
+    write_explanations(out, args.model, entries)
+    print(f"Wrote {len(entries)} explanation(s) to {out}")
+    if failed:
+        print(f"{len(failed)} word(s) failed, run again to retry: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
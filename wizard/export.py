@@ -0,0 +1,154 @@
+"""Compile lessons into self-contained static HTML pages.
+
+Each lesson becomes one ``<lesson-id>/index.html`` with the stylesheet, a
+small vanilla-JS player (``export_assets/lesson.js``) and the lesson data
+inlined. Answers are checked, progress is kept (in localStorage) and
+successes are celebrated entirely in the browser, so any static file server
+or CDN can host a whole school with no Python running at all.
+
+Explanations are embedded, never fetched: the local spelling rules
+(``wizard.rules``) first, then the pregenerated file and the explanation
+cache. Words with neither simply show no tip - Gemini is never called.
+
+    python -m wizard.export --out dist           # every lesson, plus dist/index.html
+    python -m wizard.export --lesson lesson-06 --out dist
+"""
+import argparse
+import html
+import json
+import os
+import sys
+
+from wizard import ROOT_DIR, rules
+from wizard.cache import DEFAULT_PATH as CACHE_PATH, make_key
+from wizard.explanations import lesson_words, load_explanations
+from wizard.gemini import GEMINI_MODEL, explanation_prompt
+from wizard.lessons import EXPLANATIONS_FILE, LESSONS_DIR, LessonCatalog
+from wizard.shared import cached_explanations
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "export_assets")
+STYLESHEET = os.path.join(ROOT_DIR, "static", "wizard.css")
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def word_parts(lesson):
+    """{word: syllables or word-builder parts} - hints for the spelling rules"""
+    parts = {t.target_word: t.parts for t in lesson.word_builder}
+    parts.update({t.word: t.correct_syllables for t in lesson.syllables})
+    return parts
+
+
+def lesson_explanations(lesson, known, model_name=GEMINI_MODEL):
+    """{lowercase word: explanation} for every tip word that has one"""
+    parts = word_parts(lesson)
+    explanations = {}
+    for word in lesson_words(lesson):
+        text = rules.explain(word, parts.get(word)) or known.get(make_key(model_name, explanation_prompt(word)))
+        if text:
+            explanations.setdefault(word.lower(), text)
+    return explanations
+
+
+def lesson_data(lesson, explanations):
+    """The JSON the player reads; deliberately flat and independent of the pack format"""
+    return {
+        "id": lesson.id,
+        "title": lesson.title,
+        "focus": list(lesson.focus),
+        "syllables": [{"id": t.id, "word": t.word, "syllables": list(t.correct_syllables)} for t in lesson.syllables],
+        "wordBuilder": [
+            {"id": t.id, "parts": list(t.parts), "meaning": t.meaning, "word": t.target_word}
+            for t in lesson.word_builder
+        ],
+        "sentences": [
+            {"id": t.id, "before": t.sentence_part1, "after": t.sentence_part2, "options": list(t.options),
+             "answer": t.correct_option}
+            for t in lesson.sentences
+        ],
+        "antonyms": [{"id": t.id, "clue": t.clue, "answer": t.answer} for t in lesson.antonyms],
+        "yesNo": [{"id": t.id, "question": t.question, "answer": t.answer} for t in lesson.yes_no],
+        "reading": [
+            {"id": s.id, "title": s.title, "paragraphs": list(s.paragraphs),
+             "questions": [{"question": q.question, "options": list(q.options), "answer": q.correct_answer}
+                           for q in s.questions]}
+            for s in lesson.stories
+        ],
+        "partsPool": list(lesson.parts_pool),
+        "explanations": explanations,
+    }
+
+
+def render_lesson(lesson, explanations):
+    data = json.dumps(lesson_data(lesson, explanations), ensure_ascii=False, separators=(",", ":"))
+    page = _read(os.path.join(ASSETS_DIR, "lesson.html"))
+    # Placeholders are swapped in one pass so lesson text can never be mistaken for one
+    replacements = {
+        "__TITLE__": html.escape(lesson.full_title),
+        "__CSS__": _read(STYLESHEET) + "\n" + _read(os.path.join(ASSETS_DIR, "lesson.css")),
+        "__DATA__": data.replace("</", "<\\/"),  # keep "</script>" in a story from closing the tag
+        "__SCRIPT__": _read(os.path.join(ASSETS_DIR, "lesson.js")),
+    }
+    out, rest = [], page
+    while rest:
+        hits = [(rest.find(k), k) for k in replacements if k in rest]
+        if not hits:
+            out.append(rest)
+            break
+        pos, key = min(hits)
+        out += [rest[:pos], replacements[key]]
+        rest = rest[pos + len(key):]
+    return "".join(out)
+
+
+def render_index(catalog):
+    links = "\n".join(
+        f'<li><a href="{html.escape(e.id)}/index.html">{html.escape(e.title)}</a></li>' for e in catalog.entries
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8"><title>Trident Word Wizards</title></head>\n'
+        f"<body>\n<h1>Trident Word Wizards 🧙‍♂️</h1>\n<ul>\n{links}\n</ul>\n</body>\n</html>\n"
+    )
+
+
+def export(out_dir, lesson_ids=None, lessons_dir=LESSONS_DIR, cache_path=CACHE_PATH, model_name=GEMINI_MODEL):
+    """Write one page per lesson (all of them by default); returns {lesson id: path}"""
+    catalog = LessonCatalog(lessons_dir)
+    known = cached_explanations(cache_path)
+    known.update(load_explanations(os.path.join(lessons_dir, EXPLANATIONS_FILE)))
+    written = {}
+    for lesson_id in lesson_ids or [e.id for e in catalog.entries]:
+        lesson = catalog.load(lesson_id)
+        path = os.path.join(out_dir, lesson.id, "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_lesson(lesson, lesson_explanations(lesson, known, model_name)))
+        written[lesson.id] = path
+    if not lesson_ids:
+        with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(render_index(catalog))
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m wizard.export", description="export lessons as static HTML")
+    parser.add_argument("--out", default=os.path.join(ROOT_DIR, "dist"))
+    parser.add_argument("--lesson", action="append", dest="lessons", help="lesson id (repeatable; default: all)")
+    parser.add_argument("--lessons-dir", default=LESSONS_DIR)
+    parser.add_argument("--cache", default=CACHE_PATH, help="explanation cache SQLite file to take tips from")
+    args = parser.parse_args(argv)
+
+    catalog = LessonCatalog(args.lessons_dir)
+    unknown = [l for l in args.lessons or [] if l not in catalog]
+    if unknown:
+        parser.error(f"unknown lesson(s): {', '.join(unknown)}")
+    for lesson_id, path in export(args.out, args.lessons, args.lessons_dir, args.cache).items():
+        print(f"{lesson_id}: {path} ({os.path.getsize(path) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+// Trident Word Wizards - static lesson player.
+//
+// Everything the Streamlit app does per click (checking answers, tracking
+// progress, celebrating, showing the Wizard's explanation) happens here in
+// the browser. The lesson and its precomputed explanations are embedded in
+// the page by `python -m wizard.export`; progress lives in localStorage.
+(function () {
+  "use strict";
+
+  var lesson = JSON.parse(document.getElementById("lesson-data").textContent);
+  var app = document.getElementById("app");
+  var storageKey = "wizard:" + lesson.id;
+
+  var ACTIVITIES = [
+    {key: "syllables", label: "✂️ Syllable Split", render: syllables},
+    {key: "wordBuilder", label: "🔨 Word Builder", render: wordBuilder},
+    {key: "sentences", label: "✍️ Sentence Master", render: sentences},
+    {key: "antonyms", label: "🔄 Opposites", render: antonyms},
+    {key: "yesNo", label: "👍 Yes or No?", render: yesNo},
+    {key: "reading", label: "📖 Reading Comp", render: reading},
+  ];
+
+  // --- Progress (item ids done per activity, plus a few settings) ---
+
+  function load() {
+    try {
+      return JSON.parse(localStorage.getItem(storageKey)) || {};
+    } catch (e) {
+      return {};
+    }
+  }
+
+  var saved = load();
+  var progress = saved.progress || {};
+  var settings = saved.settings || {mode: "normal", fontSize: 20, story: 0};
+
+  function save() {
+    try {
+      localStorage.setItem(storageKey, JSON.stringify({progress: progress, settings: settings}));
+    } catch (e) {
+      // Private browsing or storage full: progress just lasts for this visit
+    }
+  }
+
+  function done(activity) {
+    return progress[activity] || (progress[activity] = []);
+  }
+
+  function markDone(activity, id) {
+    if (done(activity).indexOf(id) < 0) {
+      done(activity).push(id);
+      save();
+    }
+  }
+
+  function nextItem(activity) {
+    var items = lesson[activity];
+    for (var i = 0; i < items.length; i++) {
+      if (done(activity).indexOf(items[i].id) < 0) return i;
+    }
+    return null;
+  }
+
+  function resetActivity(activity) {
+    progress[activity] = [];
+    save();
+  }
+
+  // --- DOM helpers ---
+
+  function h(tag, attrs) {
+    var el = document.createElement(tag);
+    Object.keys(attrs || {}).forEach(function (name) {
+      var value = attrs[name];
+      if (name === "onclick" || name === "oninput" || name === "onchange") el[name] = value;
+      else if (name === "text") el.textContent = value;
+      else if (value !== false && value != null) el.setAttribute(name, value === true ? "" : value);
+    });
+    for (var i = 2; i < arguments.length; i++) {
+      var child = arguments[i];
+      if (child == null || child === false) continue;
+      el.appendChild(typeof child === "string" ? document.createTextNode(child) : child);
+    }
+    return el;
+  }
+
+  function banner(kind, text) {
+    return h("div", {"class": "banner " + kind, text: text});
+  }
+
+  function toast(text) {
+    var el = h("div", {"class": "toast", text: text});
+    document.getElementById("toasts").appendChild(el);
+    setTimeout(function () { el.remove(); }, 3000);
+  }
+
+  // Randomized visual reward, like celebrate_success in the app
+  function celebrate() {
+    var effects = [
+      function () { burst(["🎈", "🎈", "🎉", "🎈"]); },
+      function () { burst(["❄️", "⛄", "❄️"]); },
+      function () {
+        toast("✨ Magical! Outstanding Work! ✨");
+        toast("⭐ You are a Word Wizard! 🌟");
+      },
+    ];
+    effects[Math.floor(Math.random() * effects.length)]();
+  }
+
+  function burst(symbols) {
+    for (var i = 0; i < 24; i++) {
+      var el = h("div", {"class": "burst", text: symbols[i % symbols.length]});
+      el.style.left = Math.random() * 100 + "vw";
+      el.style.animationDelay = Math.random() * 0.6 + "s";
+      document.body.appendChild(el);
+      setTimeout(el.remove.bind(el), 3500);
+    }
+  }
+
+  function shuffle(list) {
+    for (var i = list.length - 1; i > 0; i--) {
+      var j = Math.floor(Math.random() * (i + 1));
+      var t = list[i]; list[i] = list[j]; list[j] = t;
+    }
+    return list;
+  }
+
+  function wizardTip(word) {
+    var text = lesson.explanations[word.toLowerCase()];
+    return text ? banner("success", "Wizard says (" + word + "): " + text) : null;
+  }
+
+  // --- Screens ---
+
+  var screen = {activity: null, flash: null};
+
+  function show(activity) {
+    screen = {activity: activity, flash: null};
+    render();
+  }
+
+  function render(flash) {
+    if (flash !== undefined) screen.flash = flash;
+    app.textContent = "";
+    if (!screen.activity) return menu();
+    var activity = ACTIVITIES.filter(function (a) { return a.key === screen.activity; })[0];
+    app.appendChild(h("button", {"class": "link", text: "← Back to Menu", onclick: function () { show(null); }}));
+    if (screen.flash) app.appendChild(screen.flash);
+    activity.render();
+  }
+
+  function menu() {
+    app.appendChild(h("h1", {"class": "main-header", text: "Trident Word Wizards 🧙‍♂️"}));
+    app.appendChild(h("p", {"class": "sub-header", text: lesson.title + ": " + lesson.focus.join(" & ")}));
+    var row = h("div", {"class": "row menu"});
+    ACTIVITIES.forEach(function (a) {
+      var items = lesson[a.key];
+      if (!items.length) return;
+      var count = a.key === "reading" ? "" : done(a.key).length + " / " + items.length;
+      row.appendChild(h("button", {onclick: function () { show(a.key); }}, a.label, h("small", {text: count})));
+    });
+    app.appendChild(row);
+    app.appendChild(h("hr"));
+    app.appendChild(h("button", {text: "🗑️ Reset All Progress", onclick: function () {
+      progress = {};
+      settings.story = 0;
+      save();
+      render();
+      toast("Progress Reset!");
+    }}));
+  }
+
+  function finished(activity, message, resetLabel) {
+    app.appendChild(banner("success", message));
+    app.appendChild(h("button", {text: resetLabel, onclick: function () { resetActivity(activity); render(null); }}));
+  }
+
+  function counter(activity, index) {
+    return h("p", {}, h("b", {text: "Item " + (index + 1) + " of " + lesson[activity].length}));
+  }
+
+  function syllables() {
+    app.appendChild(h("h2", {text: "✂️ Syllable Detective"}));
+    var index = nextItem("syllables");
+    if (index === null) return finished("syllables", "You've mastered all words! 🎉", "Start Over");
+    var task = lesson.syllables[index];
+    app.appendChild(counter("syllables", index));
+    app.appendChild(h("div", {"class": "sentence-display", text: task.word}));
+    app.appendChild(h("p", {"class": "center", text: "Split the word into its " + task.syllables.length + " syllables:"}));
+
+    var inputs = task.syllables.map(function (_, i) {
+      return h("input", {type: "text", autocomplete: "off", "aria-label": "Syllable " + (i + 1)});
+    });
+    var boxes = h("div", {"class": "row"});
+    inputs.forEach(function (input) { boxes.appendChild(h("div", {}, input)); });
+    var form = h("form", {"class": "syllable-form"}, boxes,
+      h("button", {"class": "primary", type: "submit", text: "Check Answer"}));
+    form.onsubmit = function (event) {
+      event.preventDefault();
+      var answer = inputs.map(function (input) { return input.value.trim().toLowerCase(); });
+      if (answer.join("|") === task.syllables.join("|")) {
+        celebrate();
+        markDone("syllables", task.id);
+        render(wizardTip(task.word));
+      } else {
+        // Keep what was typed; just explain underneath
+        toast("❌ Not quite! Try again.");
+        hint.textContent = "";
+        hint.appendChild(banner("error", "Not quite! Check your splits. Is the suffix in one box?"));
+      }
+    };
+    var hint = h("div");
+    app.appendChild(form);
+    app.appendChild(hint);
+    inputs[0].focus();
+  }
+
+  var building = {id: null, mode: null, parts: [], build: []};
+
+  function wordBuilder() {
+    app.appendChild(h("h2", {text: "🔨 Word Construction Site"}));
+    var modes = h("div", {"class": "row"});
+    ["normal", "challenge"].forEach(function (mode) {
+      modes.appendChild(h("label", {},
+        h("input", {type: "radio", name: "mode", checked: settings.mode === mode, onchange: function () {
+          settings.mode = mode;
+          save();
+          render(null);
+        }}), " " + mode));
+    });
+    app.appendChild(modes);
+
+    var index = nextItem("wordBuilder");
+    if (index === null) return finished("wordBuilder", "All words built! 🏗️", "Reset Construction");
+    var task = lesson.wordBuilder[index];
+    // Shuffle once per word (and mode), like the app's stored layout
+    if (building.id !== task.id || building.mode !== settings.mode) {
+      var parts = task.parts.slice();
+      if (settings.mode === "challenge") {
+        var others = shuffle(lesson.partsPool.filter(function (p) { return task.parts.indexOf(p) < 0; }));
+        parts = parts.concat(others.slice(0, 3));
+      }
+      building = {id: task.id, mode: settings.mode, parts: shuffle(parts), build: []};
+    }
+
+    app.appendChild(h("h3", {text: "1. The Blueprint"}));
+    app.appendChild(h("div", {"class": "wb-workshop"}, h("h3", {text: "Meaning: " + task.meaning})));
+    app.appendChild(h("h3", {text: "2. Construction Zone"}));
+    var bin = h("div", {"class": "wb-parts-bin"},
+      h("div", {"class": "built-word-display", text: building.build.join("") || "?"}),
+      h("p", {}, h("b", {text: "Click parts to add them:"})));
+    var row = h("div", {"class": "row"});
+    building.parts.forEach(function (part) {
+      row.appendChild(h("button", {text: part, onclick: function () {
+        building.build.push(part);
+        render(null);
+      }}));
+    });
+    bin.appendChild(row);
+    app.appendChild(bin);
+
+    app.appendChild(h("div", {"class": "row wb-controls"},
+      h("button", {text: "↺ Reset Word", onclick: function () { building.build = []; render(null); }}),
+      h("button", {"class": "primary", text: "✅ Check Answer", onclick: function () {
+        var built = building.build.join("");
+        if (built === task.word) {
+          celebrate();
+          markDone("wordBuilder", task.id);
+          render(wizardTip(task.word));
+        } else {
+          toast("❌ Not quite! Try again.");
+          building.build = [];
+          render(banner("error", "Try again! You built '" + built + "'"));
+        }
+      }})));
+  }
+
+  function sentences() {
+    app.appendChild(h("h2", {text: "✍️ Sentence Master"}));
+    var index = nextItem("sentences");
+    if (index === null) return finished("sentences", "You have completed all sentences! 🎓", "Start Over");
+    var task = lesson.sentences[index];
+    app.appendChild(counter("sentences", index));
+    app.appendChild(h("div", {"class": "sentence-display"},
+      task.before + " ", h("span", {"class": "blank-space", text: "_______"}), " " + task.after));
+    app.appendChild(h("h3", {"class": "center", text: "Choose the missing word:"}));
+    var row = h("div", {"class": "row big-choice"});
+    task.options.forEach(function (option) {
+      row.appendChild(h("button", {text: option, onclick: function () {
+        if (option === task.answer) {
+          celebrate();
+          markDone("sentences", task.id);
+          render(h("div", {"class": "sentence-display", style: "border: 3px solid #28a745;"},
+            task.before + " ", h("span", {"class": "filled-word", text: option}), " " + task.after));
+        } else {
+          toast("❌ '" + option + "' is not correct. Try the other one!");
+        }
+      }}));
+    });
+    app.appendChild(row);
+  }
+
+  var bubbles = {id: null, options: [], answered: false};
+
+  function antonyms() {
+    app.appendChild(h("h2", {text: "🔄 Opposites (Tap to Fill)"}));
+    var index = nextItem("antonyms");
+    if (bubbles.answered && bubbles.index != null) index = bubbles.index;
+    if (index === null) return finished("antonyms", "All opposites found! ☯️", "Play Again");
+    var task = lesson.antonyms[index];
+    if (bubbles.id !== task.id) {
+      var others = shuffle(lesson.antonyms.filter(function (t) { return t.answer !== task.answer; })
+        .map(function (t) { return t.answer; }));
+      bubbles = {id: task.id, index: index, options: shuffle([task.answer].concat(others.slice(0, 3))), answered: false};
+    }
+    app.appendChild(counter("antonyms", index));
+    app.appendChild(h("div", {"class": "antonym-clue", text: task.clue}));
+    app.appendChild(h("div", {"class": "center", style: "font-size: 2.5rem; margin: 10px 0;", text: "⇄"}));
+    app.appendChild(h("div", {"class": "center"}, bubbles.answered
+      ? h("div", {"class": "antonym-answer-box", text: task.answer})
+      : h("div", {"class": "antonym-placeholder", text: "?"})));
+
+    if (!bubbles.answered) {
+      app.appendChild(banner("info", "Tap the bubble that means the opposite!"));
+      var row = h("div", {"class": "row bubbles"});
+      bubbles.options.forEach(function (option) {
+        row.appendChild(h("button", {text: option, onclick: function () {
+          if (option === task.answer) {
+            celebrate();
+            markDone("antonyms", task.id);
+            bubbles.answered = true;
+            render(null);
+          } else {
+            toast("❌ Not quite! Try again.");
+          }
+        }}));
+      });
+      app.appendChild(row);
+    } else {
+      app.appendChild(h("div", {"class": "row"}, h("button", {"class": "primary", text: "Next Word ➡", onclick: function () {
+        bubbles = {id: null, options: [], answered: false};
+        render(null);
+      }})));
+    }
+  }
+
+  var question = {id: null, answered: null};
+
+  function yesNo() {
+    app.appendChild(h("h2", {text: "👍 Yes or No?"}));
+    var index = question.answered ? question.index : nextItem("yesNo");
+    if (index === null) return finished("yesNo", "You finished the questions! ✅", "Restart");
+    var task = lesson.yesNo[index];
+    app.appendChild(counter("yesNo", index));
+    app.appendChild(h("div", {"class": "sentence-display"}, h("h2", {text: task.question})));
+    if (!question.answered) {
+      var answer = function (yes) {
+        return function () {
+          var right = yes === task.answer;
+          if (right) celebrate(); else toast("❌ Not quite! Try again.");
+          markDone("yesNo", task.id);
+          question = {id: task.id, index: index, answered: right ? "correct" : "wrong"};
+          render(null);
+        };
+      };
+      app.appendChild(h("div", {"class": "row yes-no"},
+        h("button", {text: "YES 👍", onclick: answer(true)}),
+        h("button", {text: "NO 👎", onclick: answer(false)})));
+    } else {
+      app.appendChild(question.answered === "correct"
+        ? banner("success", "Correct Answer!")
+        : banner("error", "Oops! That was incorrect."));
+      app.appendChild(h("div", {"class": "row"}, h("button", {"class": "primary", text: "Next Question ➡", onclick: function () {
+        question = {id: null, answered: null};
+        render(null);
+      }})));
+    }
+  }
+
+  var storyRead = false;
+
+  function reading() {
+    app.appendChild(h("h2", {text: "📖 Reading Comprehension"}));
+    var story = lesson.reading[settings.story % lesson.reading.length];
+    var slider = h("input", {type: "range", min: 16, max: 32, value: settings.fontSize, oninput: function () {
+      // Only the CSS variable changes; the story is not re-rendered
+      settings.fontSize = +slider.value;
+      app.style.setProperty("--story-font-size", slider.value + "px");
+      save();
+    }});
+    app.style.setProperty("--story-font-size", settings.fontSize + "px");
+    app.appendChild(h("label", {}, "Adjust Text Size: ", slider));
+
+    var box = h("div", {"class": "story-box"}, h("h3", {text: story.title}));
+    story.paragraphs.forEach(function (p) { box.appendChild(h("p", {text: p})); });
+    var left = h("div", {}, box);
+    if (!storyRead) {
+      left.appendChild(h("hr"));
+      left.appendChild(h("button", {text: "✅ I have read the story", onclick: function () {
+        storyRead = true;
+        render(null);
+      }}));
+    }
+
+    var quiz = h("div", {"class": "quiz-box"});
+    var key = "reading-" + story.id;
+    var answered = done(key);
+    if (!storyRead) {
+      quiz.appendChild(banner("info", "Please read the story and click the confirmation button to start the quiz."));
+    } else if (answered.length < story.questions.length) {
+      var qIndex = answered.length;
+      var q = story.questions[qIndex];
+      quiz.appendChild(h("h3", {text: "Quiz Time!"}));
+      quiz.appendChild(h("p", {}, h("b", {text: "Q" + (qIndex + 1) + ": " + q.question})));
+      q.options.forEach(function (option, i) {
+        quiz.appendChild(h("label", {}, h("input", {type: "radio", name: key, value: option, checked: i === 0}), " " + option));
+      });
+      quiz.appendChild(h("button", {text: "Check Answer", onclick: function () {
+        var choice = quiz.querySelector("input:checked");
+        if (choice && choice.value === q.answer) {
+          celebrate();
+          markDone(key, qIndex);
+          render(banner("success", "Correct!"));
+        } else {
+          toast("❌ Not quite! Try again.");
+        }
+      }}));
+    } else {
+      quiz.appendChild(banner("success", "Story Completed! 📚"));
+      quiz.appendChild(h("button", {text: "Read Next Story", onclick: function () {
+        resetActivity(key);
+        settings.story = (settings.story + 1) % lesson.reading.length;
+        storyRead = false;
+        save();
+        render(null);
+      }}));
+    }
+    app.appendChild(h("div", {"class": "reading"}, left, quiz));
+  }
+
+  render();
+})();
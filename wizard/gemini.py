@@ -0,0 +1,58 @@
+"""Thin, lazily initialised Gemini client.
+
+``google.generativeai`` drags in protobuf and gRPC, so it is only imported
+the first time a tip is actually generated - never at page load.
+"""
+import threading
+import time
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+
+def explanation_prompt(word):
+    return f"Explain to a 4th grade student why the word '{word}' is spelled with its specific suffix (-able or -ible). Keep it encouraging and brief (under 30 words)."
+
+
+class GeminiClient:
+    def __init__(self, api_key, model_name=GEMINI_MODEL, timeout=None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.timeout = timeout  # seconds per call; None leaves it to the SDK
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def _request_options(self):
+        return {"timeout": self.timeout} if self.timeout else None
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt, request_options=self._request_options()).text
+
+    def stream(self, prompt):
+        """Yield the answer in chunks as Gemini produces them, within the same per-call timeout"""
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        for chunk in self.model.generate_content(prompt, stream=True, request_options=self._request_options()):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Gemini stream took longer than {self.timeout}s")
+            if chunk.text:
+                yield chunk.text
+
+    def warm_up(self):
+        """Import the SDK and open the channel with a cheap, unbilled call"""
+        try:
+            self.model.count_tokens("warm up")
+        except Exception:
+            pass
+
+    def warm_up_in_background(self):
+        threading.Thread(target=self.warm_up, daemon=True, name="wizard-warmup").start()
@@ -0,0 +1,207 @@
+"""Lesson packs: one JSON file per lesson plus a small catalog index.
+
+A pack looks like::
+
+    {
+      "format": 1,
+      "id": "lesson-06",
+      "title": "Lesson 6",
+      "focus": ["-able", "-ible"],
+      "activities": {
+        "syllables":   [{"id": 1, "word": "...", "correctSyllables": [...]}],
+        "wordBuilder": [{"id": 1, "parts": [...], "meaning": "...", "targetWord": "..."}],
+        "sentences":   [{"id": 1, "sentencePart1": "...", "sentencePart2": "...",
+                         "options": [...], "correctOption": "..."}],
+        "antonyms":    [{"id": 1, "clue": "...", "answer": "..."}],
+        "yesNo":       [{"id": 1, "question": "...", "answer": true}],
+        "reading":     [{"id": 1, "title": "...", "paragraphs": [...],
+                         "questions": [{"question": "...", "options": [...],
+                                        "correctAnswer": "..."}]}]
+      }
+    }
+
+The lesson id is at most 16 bytes of UTF-8, item ids are integers from 0 to
+2**32 - 1 (unique within an activity), and a story has at most 255
+questions - the sizes the answer log stores them in. Every activity is
+optional. ``catalog.json`` lists ``{"id", "title", "file"}`` for each pack,
+so startup only reads the index - a pack is parsed the first time a student
+opens that lesson. Rebuild the index after adding packs with::
+
+    python -m wizard.lessons reindex
+"""
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from wizard import ROOT_DIR
+from wizard.content import (
+    ACTIVITIES,
+    MAX_ITEM_ID,
+    MAX_LESSON_ID_BYTES,
+    MAX_STORY_QUESTIONS,
+    AntonymItem,
+    Lesson,
+    ReadingQuestion,
+    ReadingStory,
+    SentenceItem,
+    SyllableItem,
+    WordBuilderItem,
+    YesNoItem,
+)
+
+FORMAT_VERSION = 1
+LESSONS_DIR = os.path.join(ROOT_DIR, "lessons")
+CATALOG_FILE = "catalog.json"
+# Written by ``python -m wizard.explanations pregenerate``; not a pack
+EXPLANATIONS_FILE = "explanations.json"
+
+
+class LessonPackError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: str
+    title: str
+    file: str
+
+
+def _syllable(d):
+    return SyllableItem(d["id"], d["word"], tuple(d["correctSyllables"]))
+
+
+def _word_builder(d):
+    return WordBuilderItem(d["id"], tuple(d["parts"]), d["meaning"], d["targetWord"])
+
+
+def _sentence(d):
+    return SentenceItem(d["id"], d["sentencePart1"], d["sentencePart2"], tuple(d["options"]), d["correctOption"])
+
+
+def _antonym(d):
+    return AntonymItem(d["id"], d["clue"], d["answer"])
+
+
+def _yes_no(d):
+    return YesNoItem(d["id"], d["question"], bool(d["answer"]))
+
+
+def _story(d):
+    questions = tuple(
+        ReadingQuestion(q["question"], tuple(q["options"]), q["correctAnswer"]) for q in d["questions"]
+    )
+    return ReadingStory(d["id"], d["title"], tuple(d["paragraphs"]), questions)
+
+
+PARSERS = {
+    "syllables": _syllable,
+    "wordBuilder": _word_builder,
+    "sentences": _sentence,
+    "antonyms": _antonym,
+    "yesNo": _yes_no,
+    "reading": _story,
+}
+
+
+def fingerprint(items):
+    """Short digest of the items' ids in order (and each story's questions).
+
+    Stored progress is positional, so it carries this and is discarded when
+    an edited pack no longer matches - reordered or swapped items included.
+    """
+    keys = [[item.id, *(q.question for q in getattr(item, "questions", ()))] for item in items]
+    return hashlib.blake2b(json.dumps(keys).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def parse_pack(data, source="<pack>"):
+    """Turn a decoded pack into a frozen ``Lesson``"""
+    if data.get("format") != FORMAT_VERSION:
+        raise LessonPackError(f"{source}: unsupported format {data.get('format')!r}")
+    lesson_id = data.get("id")
+    if not isinstance(lesson_id, str) or not 0 < len(lesson_id.encode("utf-8")) <= MAX_LESSON_ID_BYTES:
+        raise LessonPackError(f"{source}: lesson id must be 1-{MAX_LESSON_ID_BYTES} bytes of UTF-8, got {lesson_id!r}")
+    activities = data.get("activities", {})
+    unknown = set(activities) - set(PARSERS)
+    if unknown:
+        raise LessonPackError(f"{source}: unknown activities {sorted(unknown)}")
+
+    items, fingerprints = {}, {}
+    for activity, parse in PARSERS.items():
+        try:
+            parsed = tuple(parse(d) for d in activities.get(activity, ()))
+        except (KeyError, TypeError) as e:
+            raise LessonPackError(f"{source}: bad {activity} item ({e!r})") from None
+        for item in parsed:
+            if type(item.id) is not int or not 0 <= item.id <= MAX_ITEM_ID:
+                raise LessonPackError(f"{source}: {activity} item id must be an integer 0-{MAX_ITEM_ID}, got {item.id!r}")
+            if len(getattr(item, "questions", ())) > MAX_STORY_QUESTIONS:
+                raise LessonPackError(f"{source}: story {item.id} has more than {MAX_STORY_QUESTIONS} questions")
+        if len({item.id for item in parsed}) != len(parsed):
+            raise LessonPackError(f"{source}: duplicate ids in {activity}")
+        items[ACTIVITIES[activity]] = parsed
+        fingerprints[activity] = fingerprint(parsed)
+
+    return Lesson(
+        id=lesson_id,
+        title=data["title"],
+        focus=tuple(data.get("focus", ())),
+        fingerprints=MappingProxyType(fingerprints),
+        parts_pool=tuple(dict.fromkeys(p for item in items["word_builder"] for p in item.parts)),
+        **items,
+    )
+
+
+def load_pack(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_pack(json.load(f), source=os.path.basename(path))
+
+
+class LessonCatalog:
+    """The list of available lessons; packs themselves are loaded on demand"""
+
+    def __init__(self, directory=LESSONS_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, CATALOG_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+        self.entries = tuple(CatalogEntry(e["id"], e["title"], e["file"]) for e in data["lessons"])
+        self._by_id = {e.id: e for e in self.entries}
+
+    def __contains__(self, lesson_id):
+        return lesson_id in self._by_id
+
+    @property
+    def default_id(self):
+        return self.entries[0].id
+
+    def title(self, lesson_id):
+        return self._by_id[lesson_id].title
+
+    def load(self, lesson_id):
+        entry = self._by_id[lesson_id]
+        return load_pack(os.path.join(self.directory, entry.file))
+
+
+def build_catalog(directory=LESSONS_DIR):
+    """Rewrite catalog.json from the packs in `directory` (sorted by file name)"""
+    lessons = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json") or name in (CATALOG_FILE, EXPLANATIONS_FILE):
+            continue
+        lesson = load_pack(os.path.join(directory, name))
+        lessons.append({"id": lesson.id, "title": lesson.full_title, "file": name})
+    with open(os.path.join(directory, CATALOG_FILE), "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "lessons": lessons}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return lessons
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["reindex"]:
+        directory = sys.argv[2] if len(sys.argv) > 2 else LESSONS_DIR
+        print(f"Indexed {len(build_catalog(directory))} lesson pack(s) in {directory}")
+    else:
+        print("usage: python -m wizard.lessons reindex [DIRECTORY]")
@@ -0,0 +1,147 @@
+"""Compact per-activity progress tracking.
+
+Items are tracked by their position in the lesson's item tuple: a bytearray
+bitset records which are done and a cursor points at the first one that
+isn't. The cursor only moves forward (until a reset), so finding the next
+item is amortised O(1) however large the bank is. A second bitset records
+items the student got wrong at least once. The order items are shown in is
+up to ``wizard.scheduler``.
+
+``to_dict`` / ``from_dict`` give a compact JSON form (bitsets as hex) for
+``wizard.store``; per-item scratch state is never persisted. The form
+carries the pack's ``fingerprint`` for the activity, so positions are never
+applied to a pack whose items have since been reordered.
+"""
+import time
+
+from wizard.scheduler import ItemScheduler
+
+
+class ActivityProgress:
+    __slots__ = ("total", "done", "cursor", "_bits", "_missed")
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.cursor = 0
+        self._bits = bytearray((total + 7) // 8)
+        self._missed = bytearray((total + 7) // 8)
+
+    def is_done(self, index):
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def mark_missed(self, index):
+        self._missed[index >> 3] |= 1 << (index & 7)
+
+    def mark_done(self, index):
+        if not self.is_done(index):
+            self._bits[index >> 3] |= 1 << (index & 7)
+            self.done += 1
+        while self.cursor < self.total and self.is_done(self.cursor):
+            self.cursor += 1
+
+    @property
+    def complete(self):
+        return self.cursor >= self.total
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 0
+
+    def to_dict(self):
+        return {"total": self.total, "done": self._bits.hex(), "missed": self._missed.hex()}
+
+    @classmethod
+    def from_dict(cls, data):
+        progress = cls(data["total"])
+        done, missed = bytes.fromhex(data["done"]), bytes.fromhex(data["missed"])
+        if len(done) != len(progress._bits) or len(missed) != len(progress._missed):
+            raise ValueError("bitset does not match total")
+        progress._bits[:], progress._missed[:] = done, missed
+        progress.done = sum(bin(b).count("1") for b in done)
+        while progress.cursor < progress.total and progress.is_done(progress.cursor):
+            progress.cursor += 1
+        return progress
+
+
+class ActivityState:
+    """Everything one session keeps for one activity.
+
+    Memory bound: ``progress`` is ``total / 8`` bytes plus three ints, the
+    scheduler holds one heap entry per item waiting on review, and ``item``
+    holds scratch state (shuffled options, answer status, the word being
+    built...) for the *current* item only - it is evicted as soon as that
+    item is finished or another item is shown. A session therefore holds
+    O(total / 8 + missed) bytes per activity however many items it has
+    played, and resetting an activity is just dropping its record.
+    """
+
+    __slots__ = ("progress", "scheduler", "item_index", "item", "shown_at", "pack")
+
+    def __init__(self, total, pack=None):
+        self.pack = pack  # fingerprint of the items this state's positions refer to
+        self.progress = ActivityProgress(total)
+        self.scheduler = ItemScheduler()
+        self.item_index = None
+        self.item = {}
+        self.shown_at = None
+
+    def current(self):
+        """Index of the item on screen, asking the scheduler for one if needed (None when done)"""
+        if self.item_index is None:
+            index = self.scheduler.next(self.progress)
+            if index is not None:
+                self.item_state(index)
+        return self.item_index
+
+    def item_state(self, index):
+        """Scratch dict for item `index`; anything kept for another item is dropped"""
+        if index != self.item_index:
+            self.item_index = index
+            self.item = {}
+            self.shown_at = time.monotonic()
+        return self.item
+
+    def seconds_on_item(self):
+        """How long the current item has been on screen"""
+        return time.monotonic() - self.shown_at if self.shown_at is not None else 0.0
+
+    def _leave(self, index):
+        if index == self.item_index:
+            self.item_index = None
+            self.item = {}
+
+    def finish(self, index):
+        self.progress.mark_done(index)
+        self.scheduler.answered(index)
+        self._leave(index)
+
+    def record_miss(self, index):
+        """A wrong answer; the item stays on screen"""
+        self.progress.mark_missed(index)
+
+    def miss(self, index):
+        """Adaptive mode: move on now, the scheduler brings `index` back later"""
+        self.progress.mark_missed(index)
+        self.scheduler.missed(index)
+        self._leave(index)
+
+    def to_dict(self):
+        return {
+            "progress": self.progress.to_dict(),
+            "scheduler": self.scheduler.to_dict(),
+            "item_index": self.item_index,
+            "pack": self.pack,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls.__new__(cls)
+        state.pack = data.get("pack")
+        state.progress = ActivityProgress.from_dict(data["progress"])
+        state.scheduler = ItemScheduler.from_dict(data["scheduler"])
+        # The item on screen is restored (so it isn't skipped), its scratch state is not
+        state.item_index = data.get("item_index")
+        state.item = {}
+        state.shown_at = time.monotonic() if state.item_index is not None else None
+        return state
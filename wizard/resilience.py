@@ -0,0 +1,109 @@
+"""Guards around the Gemini API: a circuit breaker and a token bucket.
+
+Both are process-wide and never block. When Gemini is failing, the breaker
+opens after ``failure_threshold`` consecutive errors and every call is
+refused straight away (the student simply gets no AI tip) until
+``reset_timeout`` has passed; then one probe call is let through, and its
+outcome closes or re-opens the breaker. The token bucket caps how fast all
+sessions together may start calls, so a full class cannot push the API key
+into its quota.
+"""
+import threading
+import time
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+# Exported as a number: gauges only carry numbers
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Whether a call may go ahead now; in half-open state only one probe at a time"""
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state, self._probing = HALF_OPEN, False
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+            return True
+
+    def cancel(self):
+        """A call `allow` let through is not being made after all; frees the half-open probe"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._state, self._failures, self._probing = CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.times_opened += 1
+                self._state, self._opened_at, self._probing = OPEN, self._clock(), False
+
+    def stats(self):
+        return {
+            "state": STATE_CODES[self.state],
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`; try_acquire never waits"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self.rejected = 0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.rejected += 1
+            return False
+
+    def stats(self):
+        with self._lock:
+            self._refill()
+            return {"tokens": round(self._tokens, 2), "rejected": self.rejected}
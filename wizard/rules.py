@@ -0,0 +1,102 @@
+"""Deterministic -able/-ible explanations, no network needed.
+
+Most lesson words follow a handful of spelling rules:
+
+* a complete root word takes -able (depend -> dependable), sometimes after
+  dropping a silent e (value -> valuable), changing y to i (rely ->
+  reliable) or doubling the last consonant (forget -> forgettable);
+* a root ending in a soft ce/ge keeps its e before -able (notice ->
+  noticeable), and -ible keeps a bare c or g soft (legible, forcible);
+* a root that is not a word on its own usually takes -ible (vis -> visible).
+
+``explain`` answers in microseconds when one of these rules clearly fits
+the word's actual suffix, and returns None otherwise - including for the
+-ible words built on real words (sense -> sensible), which are left to
+Gemini. Whether a root is "a word" is decided by ``ROOT_WORDS``, so that
+lexicon should list the exceptions' roots too, or they would be explained
+with the wrong rule.
+"""
+SUFFIXES = ("able", "ible")
+PREFIXES = ("un", "in", "im", "ir", "il", "dis", "non", "re", "pre", "de")
+
+ROOT_WORDS = frozenset("""
+    accept access achieve adapt adjust admire adore advise afford agree allow answer approach argue
+    attain attach avail avoid bear believe bend blame break breathe build capture care change charge
+    cherish claim collapse collect combust comfort commend compare comprehend conceive confirm
+    consider construct consume contempt control convert correct count credit cure debate decide
+    defend define delete deny depend deplore describe desire detect digest discern dispose divide
+    drink eat edit enjoy envy erase excite excuse expand expect explain export fashion favor fit fix
+    flex forget forgive govern grasp hate hear identify ignore imagine inflate inhabit justify know
+    laugh like live love manage market measure mend move note notice obey object observe
+    obtain order pardon pass pay peace perish permit place play please predict prefer present
+    prevent print profit program protect prove punish question quote reach read realize recognize
+    recover reduce refer regret regulate rely remark remove rent repair repeat replace reply
+    report reprehend represent resist respect response return reverse reward rule season sense
+    service size solve sort spend stop suggest support sustain tax teach tolerate trace trust
+    turn use value vary view wash wear win work worship
+""".split())
+
+
+def _split(word, parts):
+    """(prefix, root) readings of the part of `word` before its suffix, whole stem first.
+
+    Lesson syllables/word-builder parts, when given, say where a prefix ends.
+    """
+    stem = word[:-4]
+    readings = [("", stem)]
+    if parts and len(parts) > 2 and parts[0].lower() in PREFIXES:
+        readings.append((parts[0].lower(), stem[len(parts[0]):]))
+    else:
+        for prefix in PREFIXES:
+            if stem.startswith(prefix) and len(stem) - len(prefix) >= 3:
+                readings.append((prefix, stem[len(prefix):]))
+    return readings
+
+
+def _build(*parts):
+    return " + ".join(p for p in parts if p)
+
+
+def _explain_able(word, prefix, root):
+    if root.endswith(("ce", "ge")) and root in ROOT_WORDS:
+        return (f"'{root}' is a complete word. Keep its e so the {root[-2]} stays soft, "
+                f"then add -able: {_build(prefix, root, 'able')} = {word}.")
+    if root in ROOT_WORDS:
+        return f"'{root}' is a complete word on its own, so it takes -able: {_build(prefix, root, 'able')} = {word}."
+    if root + "e" in ROOT_WORDS:
+        return f"'{root}e' is a complete word ending in a silent e. Drop the e and add -able: {word}."
+    if root.endswith("i") and root[:-1] + "y" in ROOT_WORDS:
+        return f"'{root[:-1]}y' is a complete word ending in y. Change the y to i and add -able: {word}."
+    if len(root) > 3 and root[-1] == root[-2] and root[:-1] in ROOT_WORDS:
+        return f"'{root[:-1]}' is a complete word. Double the last {root[-1]} and add -able: {word}."
+    return None
+
+
+def _explain_ible(word, prefix, root, parts):
+    if root.endswith(("c", "g")):
+        return f"-ible keeps the {root[-1]} soft, the way it sounds in {word}. Great spelling!"
+    built = " + ".join(p.lower() for p in parts) if parts else _build(prefix, root, "ible")
+    return f"'{root}' isn't a complete word on its own, so it usually takes -ible: {built} = {word}."
+
+
+def explain(word, parts=None):
+    """A short explanation of `word`'s suffix, or None when no rule fits it confidently.
+
+    `parts` are the word's syllables or word-builder parts from the lesson, if known.
+    """
+    word = word.strip().lower()
+    suffix = word[-4:]
+    if suffix not in SUFFIXES or len(word) < 6:
+        return None
+    readings = _split(word, parts)
+    if suffix == "able":
+        for prefix, root in readings:
+            text = _explain_able(word, prefix, root)
+            if text:
+                return text
+        return None
+    # A real word taking -ible (sense -> sensible) has no rule to point at
+    if any(root in ROOT_WORDS or root + "e" in ROOT_WORDS for _, root in readings):
+        return None
+    prefix, root = readings[-1]
+    return _explain_ible(word, prefix, root, parts)
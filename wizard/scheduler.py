@@ -0,0 +1,69 @@
+"""Which item a student sees next.
+
+Fresh items are handed out in order from a cursor. In adaptive mode a missed
+item is pushed onto a heap keyed on the turn it is due again, with the gap
+growing each time it is missed (spaced repetition). Due reviews jump ahead
+of fresh items, so picking the next item is O(1) amortised for fresh items
+and O(log m) for the m items waiting on review - however big the bank is.
+
+Time is a logical clock that ticks once per answered item ("turn"), so a
+review is due after the student has worked on a few other items, not after
+some wall-clock delay they may never sit through.
+"""
+import heapq
+
+# Turns to wait before a missed item comes back, by how often it was missed
+REVIEW_INTERVALS = (2, 5, 12, 30)
+
+
+class ItemScheduler:
+    __slots__ = ("clock", "fresh", "_due", "_misses")
+
+    def __init__(self):
+        self.clock = 0
+        self.fresh = 0
+        self._due = []  # heap of (due turn, item index)
+        self._misses = {}  # item index -> times missed, for items not yet answered
+
+    def next(self, progress):
+        """Index of the item to show next, or None when nothing is left"""
+        while self.fresh < progress.total and progress.is_done(self.fresh):
+            self.fresh += 1
+        has_fresh = self.fresh < progress.total
+        if self._due and (self._due[0][0] <= self.clock or not has_fresh):
+            due, index = heapq.heappop(self._due)
+            # Nothing else to practise: fast-forward to the review
+            self.clock = max(self.clock, due)
+            return index
+        if has_fresh:
+            self.fresh += 1
+            return self.fresh - 1
+        return None
+
+    def answered(self, index):
+        self.clock += 1
+        self._misses.pop(index, None)
+
+    def missed(self, index):
+        self.clock += 1
+        misses = self._misses[index] = self._misses.get(index, 0) + 1
+        interval = REVIEW_INTERVALS[min(misses, len(REVIEW_INTERVALS)) - 1]
+        heapq.heappush(self._due, (self.clock + interval, index))
+
+    def to_dict(self):
+        return {
+            "clock": self.clock,
+            "fresh": self.fresh,
+            "due": [list(entry) for entry in self._due],
+            "misses": [[index, n] for index, n in self._misses.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        scheduler = cls()
+        scheduler.clock = data["clock"]
+        scheduler.fresh = data["fresh"]
+        scheduler._due = [tuple(entry) for entry in data["due"]]
+        heapq.heapify(scheduler._due)
+        scheduler._misses = {index: n for index, n in data["misses"]}
+        return scheduler
@@ -0,0 +1,234 @@
+"""Read-only, memory-mapped content store for multi-process serving.
+
+``publish`` packs every lesson pack plus every known explanation (the
+pregenerated file and the SQLite cache tier) into one file. Each worker
+process attaches to it with ``SharedStore``, which ``mmap``s the file, so
+the bytes live once in the OS page cache however many workers there are.
+
+What that saves is the explanations: they are looked up straight from the
+mapping and never copied into a worker. Lessons are not shared in any
+useful sense - a worker parses each pack it serves into its own ``Lesson``
+(as it would from disk), so parsed lesson content still grows with the
+number of workers. For lessons the mapping is just a single-file catalog.
+Layout (little endian)::
+
+    header   magic "WIZSHM01", catalog offset/length, slot table offset, slot count, blob offset
+    catalog  JSON: {"lessons": [{"id", "title", "offset", "length"}, ...], "explanations": count}
+    slots    open-addressing hash table of (16-byte key digest, text offset, text length)
+    blobs    pack JSON and explanation text, UTF-8 (offsets above are relative to here)
+
+A ``SharedStore`` can stand in for both a ``LessonCatalog`` (packs are
+parsed out of the mapping on demand, one private copy per worker) and the
+explanation cache's read-only ``preloaded`` tier. Tips generated live after publishing still reach every
+worker through the cache's shared SQLite tier, and the next publish folds
+them into the mapping.
+
+    python -m wizard.shared publish
+    python -m wizard.shared serve --workers 4 --port 8501
+"""
+import argparse
+import json
+import mmap
+import os
+import signal
+import sqlite3
+import struct
+import subprocess
+import sys
+import time
+
+from wizard import CACHE_DIR, ROOT_DIR
+from wizard.cache import DEFAULT_PATH as CACHE_PATH
+from wizard.explanations import load_explanations
+from wizard.lessons import EXPLANATIONS_FILE, LESSONS_DIR, CatalogEntry, LessonCatalog, parse_pack
+
+DEFAULT_PATH = os.path.join(CACHE_DIR, "shared.bin")
+APP_PATH = os.path.join(ROOT_DIR, "able&ible.py")
+
+MAGIC = b"WIZSHM01"
+HEADER = struct.Struct("<8sQQQQQ")
+SLOT = struct.Struct("<16sQI4x")
+
+
+def _digest(key):
+    return bytes.fromhex(key)[:16]
+
+
+def _slot_index(digest, mask):
+    return int.from_bytes(digest[:8], "little") & mask
+
+
+def cached_explanations(path=CACHE_PATH):
+    """{key: text} for every row in an ExplanationCache SQLite file"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return dict(db.execute("SELECT key, value FROM explanations"))
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return {}
+
+
+def publish(path=DEFAULT_PATH, lessons_dir=LESSONS_DIR, cache_path=CACHE_PATH):
+    """Write the store atomically; workers that are already attached keep the old copy"""
+    catalog = LessonCatalog(lessons_dir)
+    explanations = cached_explanations(cache_path)
+    explanations.update(load_explanations(os.path.join(lessons_dir, EXPLANATIONS_FILE)))
+
+    blobs, offset = [], 0
+
+    def add_blob(data):
+        nonlocal offset
+        blobs.append(data)
+        offset += len(data)
+        return offset - len(data), len(data)
+
+    lessons = []
+    for entry in catalog.entries:
+        with open(os.path.join(lessons_dir, entry.file), "rb") as f:
+            pack = json.dumps(json.load(f), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        blob_offset, length = add_blob(pack)
+        lessons.append({"id": entry.id, "title": entry.title, "offset": blob_offset, "length": length})
+
+    n_slots = 1
+    while n_slots < 2 * len(explanations):
+        n_slots *= 2
+    slots = [None] * n_slots
+    for key, text in explanations.items():
+        digest = _digest(key)
+        i = _slot_index(digest, n_slots - 1)
+        while slots[i] is not None:
+            i = (i + 1) & (n_slots - 1)
+        slots[i] = (digest, *add_blob(text.encode("utf-8")))
+
+    catalog_blob = json.dumps({"lessons": lessons, "explanations": len(explanations)}, ensure_ascii=False).encode("utf-8")
+    catalog_offset = HEADER.size
+    slots_offset = catalog_offset + len(catalog_blob)
+    blobs_offset = slots_offset + n_slots * SLOT.size
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, catalog_offset, len(catalog_blob), slots_offset, n_slots, blobs_offset))
+        f.write(catalog_blob)
+        empty = SLOT.pack(b"", 0, 0)
+        for slot in slots:
+            f.write(SLOT.pack(*slot) if slot else empty)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    return {"path": path, "lessons": len(lessons), "explanations": len(explanations), "bytes": os.path.getsize(path)}
+
+
+class SharedStore:
+    """A published store, mapped read-only; acts as a LessonCatalog and an explanation lookup"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._map)
+        magic, catalog_offset, catalog_length, self._slots_offset, self._n_slots, self._blobs = header
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a shared content store")
+        catalog = json.loads(self._map[catalog_offset:catalog_offset + catalog_length])
+        self._lessons = {e["id"]: (e["offset"], e["length"]) for e in catalog["lessons"]}
+        self.entries = tuple(CatalogEntry(e["id"], e["title"], "") for e in catalog["lessons"])
+        self._titles = {e.id: e.title for e in self.entries}
+        self._size = catalog["explanations"]
+
+    # --- LessonCatalog interface ---
+
+    def __contains__(self, lesson_id):
+        return lesson_id in self._lessons
+
+    @property
+    def default_id(self):
+        return self.entries[0].id
+
+    def title(self, lesson_id):
+        return self._titles[lesson_id]
+
+    def load(self, lesson_id):
+        offset, length = self._lessons[lesson_id]
+        offset += self._blobs
+        return parse_pack(json.loads(self._map[offset:offset + length]), source=f"{self.path}:{lesson_id}")
+
+    # --- read-only explanation mapping (ExplanationCache ``preloaded``) ---
+
+    def __len__(self):
+        return self._size
+
+    def get(self, key, default=None):
+        digest = _digest(key)
+        mask = self._n_slots - 1
+        i = _slot_index(digest, mask)
+        while True:
+            slot_digest, offset, length = SLOT.unpack_from(self._map, self._slots_offset + i * SLOT.size)
+            if not length:
+                return default
+            if slot_digest == digest:
+                offset += self._blobs
+                return self._map[offset:offset + length].decode("utf-8")
+            i = (i + 1) & mask
+
+
+def serve(workers, port, store_path, streamlit_args):
+    """Publish, then run `workers` Streamlit processes on consecutive ports until interrupted"""
+    lessons_dir = os.environ.get("WIZARD_LESSONS_DIR", LESSONS_DIR)
+    print(json.dumps(publish(store_path, lessons_dir, os.environ.get("WIZARD_CACHE_PATH", CACHE_PATH))))
+    env = dict(os.environ, WIZARD_SHARED_STORE=store_path)
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.port", str(port + n),
+             "--server.headless", "true", *streamlit_args],
+            env=env,
+            cwd=ROOT_DIR,  # so .streamlit/config.toml applies
+        )
+        for n in range(workers)
+    ]
+    print(f"{workers} worker(s) on ports {port}-{port + workers - 1}; "
+          "put them behind a proxy with sticky sessions (e.g. nginx ip_hash)")
+
+    def stop(*_):
+        for p in procs:
+            p.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while all(p.poll() is None for p in procs):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+        for p in procs:
+            p.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m wizard.shared")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pub = commands.add_parser("publish", help="build the shared store from the lessons and explanation cache")
+    pub.add_argument("--lessons-dir", default=LESSONS_DIR)
+    pub.add_argument("--cache", default=CACHE_PATH, help="explanation cache SQLite file to fold in")
+    pub.add_argument("--out", default=DEFAULT_PATH)
+    run = commands.add_parser("serve", help="publish, then start several Streamlit workers attached to it")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    run.add_argument("--port", type=int, default=8501, help="first worker's port")
+    run.add_argument("--store", default=DEFAULT_PATH)
+    run.add_argument("streamlit_args", nargs=argparse.REMAINDER, help="passed on to 'streamlit run' (after --)")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        print(json.dumps(publish(args.out, args.lessons_dir, args.cache)))
+    else:
+        extra = args.streamlit_args[1:] if args.streamlit_args[:1] == ["--"] else args.streamlit_args
+        serve(args.workers, args.port, args.store, extra)
+
+
+if __name__ == "__main__":
+    main()
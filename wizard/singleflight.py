@@ -0,0 +1,49 @@
+"""Coalesce concurrent identical calls onto one in-flight call.
+
+When a whole class reaches the same word within seconds of each other, every
+session asks for the same explanation. The first caller for a key starts the
+work on the executor; anyone asking for that key while it is still running
+gets the same ``Flight`` back - its future, and the text streamed so far -
+instead of issuing a call of their own.
+"""
+import threading
+
+
+class Flight:
+    """One in-flight call: its future, and the latest partial result for streaming readers"""
+    __slots__ = ("future", "partial")
+
+    def __init__(self):
+        self.future = None
+        self.partial = None
+
+
+class SingleFlight:
+    def __init__(self, executor):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    def submit(self, key, fn, *args):
+        """The Flight for `key`; fn(*args, flight) only runs if none is in flight already"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight
+            flight = self._flights[key] = Flight()
+            flight.future = self._executor.submit(fn, *args, flight)
+            self.issued += 1
+        # Outside the lock: the callback runs right here if the call has already finished
+        flight.future.add_done_callback(lambda _: self._forget(key, flight))
+        return flight
+
+    def _forget(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def stats(self):
+        return {"issued": self.issued, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,93 @@
+"""Durable student progress in a local SQLite file.
+
+One row per (student, lesson, activity) holds that activity's progress as
+JSON (see ``ActivityState.to_dict``), so loading a returning student is a
+single primary-key range query. Writes never happen on the script thread:
+``save`` / ``delete`` only enqueue, and one writer thread per process drains
+the queue in batches - later writes to the same row replace earlier ones -
+committing each batch in one WAL transaction. A click therefore never waits
+on fsync, at the cost of losing the last ``linger`` seconds if the process
+is killed outright (``close`` flushes on a clean shutdown).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from wizard import CACHE_DIR
+from wizard.batching import BatchWriter
+
+DEFAULT_PATH = os.path.join(CACHE_DIR, "progress.sqlite3")
+
+log = logging.getLogger("wizard.store")
+
+
+def _connect(path):
+    db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class ProgressStore(BatchWriter):
+    def __init__(self, path=DEFAULT_PATH, linger=0.2, max_batch=500):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Reads share one pooled connection; the writer thread has its own
+        self._db = _connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            " student TEXT NOT NULL, lesson TEXT NOT NULL, activity TEXT NOT NULL,"
+            " state TEXT NOT NULL, updated REAL NOT NULL,"
+            " PRIMARY KEY (student, lesson, activity)) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        super().__init__("wizard-progress-writer", linger, max_batch)
+
+    def load(self, student, lesson):
+        """{activity: decoded state} for one student and lesson"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT activity, state FROM progress WHERE student = ? AND lesson = ?", (student, lesson)
+            ).fetchall()
+        return {activity: json.loads(state) for activity, state in rows}
+
+    def save(self, student, lesson, activity, state):
+        self._put(((student, lesson, activity), json.dumps(state, separators=(",", ":"))))
+
+    def delete(self, student, lesson, activity):
+        self._put(((student, lesson, activity), None))
+
+    def _open_writer(self):
+        self._writer_db = _connect(self.path)
+
+    def _close_writer(self):
+        self._writer_db.close()
+
+    def _write_batch(self, items):
+        pending = dict(items)  # last write per row wins
+        self._commit(self._writer_db, pending)
+
+    def _commit(self, db, pending):
+        now = time.time()
+        upserts = [(*key, value, now) for key, value in pending.items() if value is not None]
+        deletes = [key for key, value in pending.items() if value is None]
+        try:
+            db.execute("BEGIN")
+            db.executemany("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?, ?)", upserts)
+            db.executemany("DELETE FROM progress WHERE student = ? AND lesson = ? AND activity = ?", deletes)
+            db.execute("COMMIT")
+            self.batches += 1
+            self.rows_written += len(pending)
+        except sqlite3.Error as e:
+            log.warning("dropped %d progress write(s): %s", len(pending), e)
+            try:
+                db.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        return {"queued": self.queued, "batches": self.batches, "rows_written": self.rows_written}
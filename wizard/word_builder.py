@@ -0,0 +1,25 @@
+"""Word builder that assembles the word in the browser.
+
+A bidirectional Streamlit component (plain HTML/JS in ``word_builder_assets``,
+no build step): parts are clicked or dragged into the build area, with undo
+and reset, all without talking to the server. Only Check Answer sends
+anything back - one rerun per attempt instead of one per part.
+"""
+import os
+
+import streamlit.components.v1 as components
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_builder_assets")
+
+_component = components.declare_component("word_builder", path=ASSETS_DIR)
+
+
+def build_word(parts, key, handled=None, disabled=False):
+    """Show the parts bin; returns ``{"word", "attempt"}`` for the last Check Answer press, else None.
+
+    The value sticks across reruns until the next press, so callers remember
+    the ``attempt`` id they last dealt with and pass it back as ``handled``
+    (which also tells the browser the answer was checked). Give every item
+    its own ``key`` - a new key starts with an empty build.
+    """
+    return _component(parts=list(parts), handled=handled, disabled=disabled, key=key, default=None)